@@ -0,0 +1,123 @@
+import os
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+
+from typing import Any, Dict, Optional
+
+BAR_FIELDS = ("open", "high", "low", "close", "adjclose", "volume")
+BAR_DTYPE = np.dtype([("ts", "<i8")] + [(field, "<f8") for field in BAR_FIELDS])
+INDEX_FILE = "index.json"
+
+
+def to_nanoseconds(dates: Any) -> np.ndarray:
+    index = pd.DatetimeIndex(pd.to_datetime(dates, utc=True)).tz_convert(None)
+    return np.asarray(index, dtype="datetime64[ns]").view(np.int64)
+
+
+class BarStore:
+    def __init__(self, root: str, interval: str) -> None:
+        self.root = os.path.join(root, interval)
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol.upper()}.bars")
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        path = os.path.join(self.root, INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as index_file:
+            return json.load(index_file)
+
+    def _save_index(self) -> None:
+        path = os.path.join(self.root, INDEX_FILE)
+        with open(path + ".tmp", "w") as index_file:
+            json.dump(self._index, index_file)
+        os.replace(path + ".tmp", path)
+
+    def symbols(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {symbol: dict(entry) for symbol, entry in self._index.items()}
+
+    def bars(self, symbol: str) -> np.ndarray:
+        path = self._path(symbol)
+        count = os.path.getsize(path) // BAR_DTYPE.itemsize if os.path.exists(path) else 0
+        if count == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.memmap(path, dtype=BAR_DTYPE, mode="r", shape=(count,))
+
+    def read(self, symbol: str, start: Any = None, end: Any = None) -> np.ndarray:
+        bars = self.bars(symbol)
+        first = np.searchsorted(bars["ts"], to_nanoseconds([start])[0]) if start is not None else 0
+        last = np.searchsorted(bars["ts"], to_nanoseconds([end])[0]) if end is not None else len(bars)
+        return bars[first:last]
+
+    def frame(self, symbol: str, start: Any = None, end: Any = None) -> pd.DataFrame:
+        bars = self.read(symbol, start, end)
+        dates = pd.to_datetime(np.asarray(bars["ts"]))
+        return pd.DataFrame({field: bars[field] for field in BAR_FIELDS}, index=pd.DatetimeIndex(dates, name="date"))
+
+    def last(self, symbol: str) -> Optional[pd.Timestamp]:
+        entry = self._index.get(symbol.upper())
+        return pd.Timestamp(entry["last"]) if entry else None
+
+    def covered_from(self, symbol: str) -> Optional[pd.Timestamp]:
+        entry = self._index.get(symbol.upper())
+        return pd.Timestamp(entry["covered_from"]) if entry else None
+
+    def ingest(self, symbol: str, bars: pd.DataFrame, covered_from: Any = None) -> int:
+        if len(bars) == 0:
+            return 0
+        dates = bars["date"] if "date" in bars.columns else bars.index
+        records = np.zeros(len(bars), dtype=BAR_DTYPE)
+        records["ts"] = to_nanoseconds(dates)
+        for field in BAR_FIELDS:
+            records[field] = bars[field].to_numpy(dtype=np.float64) if field in bars.columns else np.nan
+        order = np.argsort(records["ts"], kind="mergesort")
+        records = records[order]
+        records = records[np.append(records["ts"][1:] != records["ts"][:-1], True)]
+
+        symbol = symbol.upper()
+        path = self._path(symbol)
+        with self._lock:
+            existing = self.bars(symbol)
+            tail = int(existing["ts"][-1]) if len(existing) else None
+            if len(records) and tail is not None and records["ts"][0] >= tail:
+                with open(path, "r+b") as bar_file:
+                    if records["ts"][0] == tail:
+                        bar_file.seek((len(existing) - 1) * BAR_DTYPE.itemsize)
+                    else:
+                        bar_file.seek(0, os.SEEK_END)
+                    bar_file.write(records.tobytes())
+                written = len(records) - int(records["ts"][0] == tail)
+            elif len(records):
+                merged = np.concatenate([np.asarray(existing), records])
+                keep = np.isin(merged["ts"], records["ts"], invert=True)
+                keep[len(existing):] = True
+                merged = merged[keep]
+                merged = merged[np.argsort(merged["ts"], kind="mergesort")]
+                with open(path + ".tmp", "wb") as bar_file:
+                    bar_file.write(merged.tobytes())
+                os.replace(path + ".tmp", path)
+                written = len(merged) - len(existing)
+            else:
+                written = 0
+
+            stored = self.bars(symbol)
+            if len(stored):
+                entry = self._index.get(symbol, {})
+                requested = [date for date in (covered_from, entry.get("covered_from")) if date is not None]
+                covered = min([int(stored["ts"][0])] + [int(ts) for ts in to_nanoseconds(requested)])
+                self._index[symbol] = {
+                    "first": str(pd.Timestamp(int(stored["ts"][0]))),
+                    "last": str(pd.Timestamp(int(stored["ts"][-1]))),
+                    "covered_from": str(pd.Timestamp(covered)),
+                    "count": len(stored)
+                }
+                self._save_index()
+        return written
@@ -0,0 +1,8 @@
+from setuptools import setup
+
+setup(
+    name="barstore",
+    version="0.1.0",
+    py_modules=["bar_store"],
+    install_requires=["numpy", "pandas"]
+)
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from bar_store import BarStore
+
+DATES = pd.date_range("2020-07-01", periods=5, freq="D")
+
+
+def bars(dates, close):
+    return pd.DataFrame({"date": pd.DatetimeIndex(dates), "close": close, "adjclose": np.multiply(close, 0.5)})
+
+
+def test_ingest_and_read_back(tmp_path):
+    store = BarStore(str(tmp_path), "1d")
+    assert store.ingest("aapl", bars(DATES, [1., 2., 3., 4., 5.])) == 5
+
+    frame = store.frame("AAPL")
+    assert list(frame.index) == list(DATES)
+    assert frame["close"].tolist() == [1., 2., 3., 4., 5.]
+    assert frame["adjclose"].tolist() == [.5, 1., 1.5, 2., 2.5]
+    assert frame["volume"].isna().all()
+    assert store.last("AAPL") == DATES[-1]
+    assert store.covered_from("AAPL") == DATES[0]
+    assert BarStore(str(tmp_path), "1d").symbols()["AAPL"]["count"] == 5
+
+
+def test_empty_frame_is_a_no_op(tmp_path):
+    store = BarStore(str(tmp_path), "1d")
+    assert store.ingest("AAPL", bars([], [])) == 0
+    assert store.last("AAPL") is None
+    store.ingest("AAPL", bars(DATES, [1., 2., 3., 4., 5.]))
+    assert store.ingest("AAPL", bars([], [])) == 0
+    assert len(store.bars("AAPL")) == 5
+
+
+def test_append_overwrites_last_bar(tmp_path):
+    store = BarStore(str(tmp_path), "1d")
+    store.ingest("AAPL", bars(DATES[:3], [1., 2., 3.]))
+    assert store.ingest("AAPL", bars(DATES[2:], [3.5, 4., 5.])) == 2
+    assert store.frame("AAPL")["close"].tolist() == [1., 2., 3.5, 4., 5.]
+
+
+def test_overlapping_ingest_replaces_and_sorts(tmp_path):
+    store = BarStore(str(tmp_path), "1d")
+    store.ingest("AAPL", bars(DATES[2:], [3., 4., 5.]))
+    shuffled = bars(DATES[[3, 0, 1, 1]], [40., 1., 9., 2.])
+    assert store.ingest("AAPL", shuffled, covered_from=DATES[0]) == 2
+    assert store.frame("AAPL")["close"].tolist() == [1., 2., 3., 40., 5.]
+    assert store.covered_from("AAPL") == DATES[0]
+
+
+def test_range_reads(tmp_path):
+    store = BarStore(str(tmp_path), "1d")
+    store.ingest("AAPL", bars(DATES, [1., 2., 3., 4., 5.]))
+    assert store.frame("AAPL", DATES[1], DATES[3])["close"].tolist() == [2., 3.]
+    assert store.frame("AAPL", start=DATES[3])["close"].tolist() == [4., 5.]
+    assert store.frame("AAPL", end=DATES[0]).empty
+    aware = DATES[1].tz_localize("US/Eastern")
+    assert store.frame("AAPL", start=aware)["close"].tolist() == [3., 4., 5.]
+    assert len(store.read("MSFT")) == 0
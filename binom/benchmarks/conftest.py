@@ -0,0 +1,28 @@
+import os
+import sys
+import pytest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from synthetic import STEPS, TRADING_YEAR_DAYS, synthetic_prices
+
+
+@pytest.fixture(scope="session")
+def prices() -> np.ndarray:
+    return synthetic_prices()
+
+
+@pytest.fixture(scope="session")
+def spot(prices: np.ndarray) -> float:
+    return float(prices[-1])
+
+
+@pytest.fixture(scope="session")
+def vol(prices: np.ndarray) -> float:
+    return float(np.diff(np.log(prices)).std() * np.sqrt(TRADING_YEAR_DAYS))
+
+
+@pytest.fixture(params=STEPS, ids=lambda steps: f"{steps}_steps")
+def steps(request) -> int:
+    return request.param
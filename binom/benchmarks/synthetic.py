@@ -0,0 +1,13 @@
+import numpy as np
+
+STEPS = [10, 100, 1000, 10000]
+RATE = 0.05
+TIME_PERIOD = 0.5
+TRADING_YEAR_DAYS = 252
+SEED = 7
+
+
+def synthetic_prices(days: int = TRADING_YEAR_DAYS, annual_vol: float = 0.3, seed: int = SEED) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0., annual_vol / np.sqrt(TRADING_YEAR_DAYS), days)
+    return 100. * np.exp(np.cumsum(returns))
@@ -0,0 +1,27 @@
+import pytest
+
+from models import MODELS
+from synthetic import RATE, TIME_PERIOD
+
+
+@pytest.mark.parametrize("model", sorted(MODELS))
+def test_build(benchmark, model, spot, vol, steps):
+    benchmark.group = f"build-{steps}"
+    lattice = benchmark(MODELS[model]().build, spot, vol, RATE, TIME_PERIOD, steps, spot)
+    assert lattice.steps >= steps
+
+
+@pytest.mark.parametrize("model", sorted(MODELS))
+def test_probabilities(benchmark, model, spot, vol, steps):
+    benchmark.group = f"probabilities-{steps}"
+    lattice = MODELS[model]().build(spot, vol, RATE, TIME_PERIOD, steps, spot)
+    probabilities = benchmark(lattice.probabilities, lattice.steps)
+    assert probabilities.sum() == pytest.approx(1.)
+
+
+@pytest.mark.parametrize("model", sorted(MODELS))
+def test_terminal_prices(benchmark, model, spot, vol, steps):
+    benchmark.group = f"prices-{steps}"
+    lattice = MODELS[model]().build(spot, vol, RATE, TIME_PERIOD, steps, spot)
+    prices = benchmark(lattice.prices, lattice.steps)
+    assert len(prices) == lattice.width(lattice.steps)
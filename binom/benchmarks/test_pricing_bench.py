@@ -0,0 +1,31 @@
+import pytest
+import numpy as np
+
+from models import MODELS
+from pricing import OptionPricer, ChainPricer, AMERICAN, EUROPEAN
+from synthetic import RATE, TIME_PERIOD
+
+CHAIN_SIZE = 50
+CHAIN_MAX_STEPS = 1000
+
+
+@pytest.mark.parametrize("model", sorted(MODELS))
+@pytest.mark.parametrize("exercise", [EUROPEAN, AMERICAN])
+def test_price(benchmark, model, exercise, spot, vol, steps):
+    benchmark.group = f"price-{exercise}-{steps}"
+    lattice = MODELS[model]().build(spot, vol, RATE, TIME_PERIOD, steps, spot)
+    result = benchmark(OptionPricer(lattice, RATE, TIME_PERIOD).price, spot, "put", exercise)
+    assert result["price"] > 0.
+
+
+@pytest.mark.parametrize("exercise", [EUROPEAN, AMERICAN])
+def test_price_chain(benchmark, exercise, spot, vol, steps):
+    if steps > CHAIN_MAX_STEPS:
+        pytest.skip(f"a {CHAIN_SIZE}-strike chain at {steps} steps is covered by test_price")
+    benchmark.group = f"chain-{exercise}-{steps}"
+    strikes = np.linspace(0.8 * spot, 1.2 * spot, CHAIN_SIZE)
+    option_types = np.where(strikes < spot, "put", "call")
+    model = MODELS["crr"]()
+    pricer = ChainPricer(lambda time_period, strike: model.build(spot, vol, RATE, time_period, steps, strike), RATE)
+    result = benchmark(pricer.price, strikes, [TIME_PERIOD] * CHAIN_SIZE, option_types, exercise)
+    assert np.all(result["price"] > 0.)
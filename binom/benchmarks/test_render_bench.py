@@ -0,0 +1,20 @@
+import os
+import pytest
+
+from models import CoxRossRubinstein
+from render import get_exporter
+from synthetic import RATE, TIME_PERIOD
+
+MAX_RENDER_STEPS = 50
+DECIMALS = 2
+
+
+@pytest.mark.parametrize("export_format", ["html", "svg", "npz", "parquet"])
+def test_export(benchmark, export_format, tmp_path, spot, vol, steps):
+    if export_format == "parquet":
+        pytest.importorskip("pyarrow")
+    benchmark.group = f"export-{steps}"
+    lattice = CoxRossRubinstein().build(spot, vol, RATE, TIME_PERIOD, steps)
+    path = os.path.join(tmp_path, f"lattice.{export_format}")
+    benchmark(get_exporter(export_format, DECIMALS, MAX_RENDER_STEPS).export, lattice, path)
+    assert os.path.getsize(path) > 0
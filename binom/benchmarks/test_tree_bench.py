@@ -0,0 +1,26 @@
+import pytest
+
+from synthetic import RATE, TIME_PERIOD
+
+binomial_tree = pytest.importorskip("binomial_tree")
+
+
+def test_binomial_tree_price(benchmark, spot, vol, steps):
+    benchmark.group = f"tree-{steps}"
+    config = {
+        "time_period_in_years": TIME_PERIOD,
+        "number_of_binomial_steps": steps,
+        "risk_free_rate": RATE,
+        "auto_volatility": False,
+        "volatility_estimate": vol,
+        "auto_p": True,
+        "p_estimate": 0.5,
+        "ticker": "SYNTHETIC",
+        "round_up_decimals": 2,
+        "strike_price": spot,
+        "option_type": "put",
+        "exercise": "american"
+    }
+    tree = binomial_tree.BinomialTree(config, current_stock_price=spot, vol=vol)
+    result = benchmark(tree.summary)
+    assert result["price"] > 0.
@@ -1,6 +1,6 @@
+import os
 import arch
 import json
-import imgkit
 import warnings
 import argparse
 
@@ -12,42 +12,64 @@ import pandas as pd
 import yfinance as yf
 import pandas_datareader.data as pdr
 
+from lattice import Lattice
+from implied_vol import ImpliedVolSolver
+from models import LatticeModel, CoxRossRubinstein, get_model, CRR
+from price_cache import PriceCache
+from render import get_exporter
+from pricing import OptionPricer, ChainPricer
+from typing import Any, Dict, List, Sequence, Tuple
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
 
 yf.pdr_override()
 
 ONE_YEAR_DAYS = 365
 ONE_YEAR_MONTHS = 12
 TRADING_YEAR_DAYS = 252
+CHUNKS_PER_WORKER = 4
 
 
 class StockVol:
-    def __init__(self, ticker: str):
+    def __init__(self, ticker: str, cache: PriceCache = None):
         self.ticker = ticker
+        self.cache = cache if cache is not None else PriceCache()
         self.end = datetime.now()
         self.start = self.end - timedelta(days=ONE_YEAR_DAYS)
-        self.stock_data = pd.DataFrame(pdr.get_data_yahoo(self.ticker,
-                                                          start=self.start.strftime("%Y-%m-%d"),
-                                                          end=self.end.strftime("%Y-%m-%d"))
-                                                          ["Adj Close"], columns=["Adj Close"])
+        self.as_of = self.end.strftime("%Y-%m-%d")
+        self.stock_data = self.cache.get_prices(self.ticker, self.start, self.end, self._download)
         self.stock_data["log"] = np.log(self.stock_data)\
                                 - np.log(self.stock_data.shift(1))
 
+    def _download(self, start: datetime, end: datetime) -> pd.Series:
+        return pdr.get_data_yahoo(self.ticker,
+                                  start=start.strftime("%Y-%m-%d"),
+                                  end=end.strftime("%Y-%m-%d"))["Adj Close"]
+
     def get_garch_sigma(self) -> float:
+        sigma = self.cache.get_sigma(self.ticker, "garch", self.as_of)
+        if sigma is not None:
+            return sigma
         model = arch.arch_model(self.stock_data["log"].dropna(),
                                   mean="Zero",
                                   vol="GARCH",
                                   p=1,
-                                  q=1).fit()
+                                  q=1).fit(starting_values=self.cache.get_params(self.ticker, "garch"))
+        self.cache.set_params(self.ticker, "garch", model.params.tolist())
         forecast = model.forecast(horizon=1)
-        return float(np.sqrt(forecast.variance.iloc[-1]))
+        sigma = float(np.sqrt(forecast.variance.iloc[-1]))
+        self.cache.set_sigma(self.ticker, "garch", self.as_of, sigma)
+        return sigma
 
     def get_mean_sigma(self) -> float:
         return self.stock_data["log"].dropna().ewm(span=TRADING_YEAR_DAYS).std().iloc[-1]
 
 
 class BinomialTree:
-    def __init__(self, config: dict):
+    def __init__(self,
+                 config: dict,
+                 current_stock_price: float = None,
+                 vol: float = None):
         self.time_period = config["time_period_in_years"]
         self.steps = config["number_of_binomial_steps"]
         self.risk_free_rate = config["risk_free_rate"]
@@ -57,79 +79,166 @@ class BinomialTree:
         self.input_p = config["p_estimate"]
         self.ticker = config["ticker"]
         self.decis = config["round_up_decimals"]
-        self.current_stock_price = self._get_mid_price()
-        self.vol = self._get_vol()
-
-    @staticmethod
-    def _get_coefficient(n: int, k: int) -> int:
-        coefficient = 1
-        k = n-k if k > n-k else k
-        for i in range(0, k):
-            coefficient = coefficient*(n-i)
-            coefficient = coefficient//(i+1)
-        return coefficient
+        self.export_formats = config.get("export_formats", ["png"])
+        self.max_render_steps = config.get("max_render_steps")
+        self.model_name = config.get("lattice_model", CRR)
+        self.model = self._get_model()
+        self.config = config
+        self.current_stock_price = self._get_mid_price() if current_stock_price is None else current_stock_price
+        self.vol = self._get_vol() if vol is None else vol
 
     def _get_vol(self) -> float:
         return StockVol(self.ticker).get_mean_sigma() * np.sqrt(ONE_YEAR_MONTHS) if self.auto_vol else self.input_vol
 
-    def _get_p_value(self, at: float, up: float, down: float) -> float:
-        return (np.exp(self.risk_free_rate * at) - down)/(up - down) if self.auto_p else self.input_p
-
     def _get_mid_price(self) -> float:
         return round((yf.Ticker(self.ticker).info["bid"] + yf.Ticker(self.ticker).info["ask"])/2., self.decis)
 
-    def export(self) -> None:
-        at = self.time_period / self.steps
-        up = np.exp(self.vol * np.sqrt(at))
-        down = 1. / up
-        prob = self._get_p_value(at, up, down)
-
-        print(f"Using volatility value of: {self.vol}")
-        print(f"Using p value of: {prob}")
-
-        stock_tree = np.zeros((self.steps + 1,
-                               self.steps + 1),
-                               dtype=tuple)
-        stock_tree[0, 0] = (self.current_stock_price, 100)
+    def _get_model(self) -> LatticeModel:
+        if self.model_name == CRR:
+            return CoxRossRubinstein(None if self.auto_p else self.input_p)
+        return get_model(self.model_name)
 
-        for i in range(1, self.steps + 1):
-            implicit_prob = round(self._get_coefficient(i, 0) * (prob ** i) * 100, self.decis)
-            stock_tree[i, 0] = (round(stock_tree[i - 1, 0][0] * up, self.decis), implicit_prob)
-            for j in range(1, i + 1):
-                implicit_prob = round(self._get_coefficient(i, j) * (prob ** (i - j)) * ((1 - prob) ** j) * 100,
-                                      self.decis)
-                stock_tree[i, j] = (round(stock_tree[i - 1, j - 1][0] * down, self.decis), implicit_prob)
-
-        styles = [
-            dict(props=[
-                ("font-size", "20px"),
-                ("border-collapse", "separate"),
-                ("border-spacing", "50px 50px")]),
-            ]
-
-        styled_table = pd.DataFrame(stock_tree).style.set_table_styles(styles).render()
-        imgkit.from_string(styled_table, f"{self.ticker}_stock_tree_{datetime.now().strftime('%Y-%m-%d_%H:%M:%S')}.png")
+    def _get_lattice(self, time_period: float = None, strike: float = None) -> Lattice:
+        return self.model.build(self.current_stock_price,
+                                self.vol,
+                                self.risk_free_rate,
+                                self.time_period if time_period is None else time_period,
+                                self.steps,
+                                self.config.get("strike_price", self.current_stock_price) if strike is None else strike)
 
+    def export(self) -> None:
+        lattice = self._get_lattice()
 
-def parse_args() -> str:
+        print(f"Using volatility value of: {self.vol}")
+        print(f"Using {self.model_name} branch probabilities of: {lattice.probs}")
+
+        timestamp = datetime.now().strftime('%Y-%m-%d_%H:%M:%S')
+        for export_format in self.export_formats:
+            exporter = get_exporter(export_format, self.decis, self.max_render_steps)
+            exporter.export(lattice, f"{self.ticker}_stock_tree_{timestamp}.{exporter.extension}")
+
+    def price(self,
+              strike: float,
+              option_type: str,
+              exercise: str) -> Dict[str, float]:
+        pricer = OptionPricer(self._get_lattice(strike=strike), self.risk_free_rate, self.time_period)
+        return pricer.price(strike, option_type, exercise)
+
+    def price_chain(self,
+                    strikes: Sequence[float],
+                    expiries: Sequence[float],
+                    option_types: Sequence[str],
+                    exercise: str) -> Dict[str, np.ndarray]:
+        pricer = ChainPricer(self._get_lattice, self.risk_free_rate, self.model.strike_dependent)
+        return pricer.price(strikes, expiries, option_types, exercise)
+
+    def implied_vols(self,
+                     strikes: Sequence[float],
+                     expiries: Sequence[float],
+                     option_types: Sequence[str],
+                     market_prices: Sequence[float],
+                     exercise: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+        solver = ImpliedVolSolver(self.model, self.current_stock_price, self.risk_free_rate, self.steps, exercise)
+        return solver.solve(strikes, expiries, option_types, market_prices)
+
+    def summary(self) -> Dict[str, Any]:
+        lattice = self._get_lattice()
+        row = {
+            "ticker": self.ticker,
+            "spot": self.current_stock_price,
+            "volatility": self.vol,
+            "model": self.model_name,
+            "up": lattice.up,
+            "down": lattice.down,
+            "p": lattice.probs[0]
+        }
+        if "strike_price" in self.config:
+            row.update(self.price(self.config["strike_price"],
+                                  self.config["option_type"],
+                                  self.config["exercise"]))
+        return row
+
+
+def _price_chunk(configs: List[dict],
+                 spots: np.ndarray,
+                 vols: np.ndarray) -> List[Dict[str, Any]]:
+    return [BinomialTree(config, float(spot), float(vol)).summary()
+            for config, spot, vol in zip(configs, spots, vols)]
+
+
+def load_configs(paths: List[str]) -> List[dict]:
+    configs = []
+    for path in paths:
+        with open(path) as conf:
+            params = json.load(conf)
+        for entry in params.get("tickers", [params.get("ticker")]):
+            configs.append(dict(params, **(entry if isinstance(entry, dict) else {"ticker": entry})))
+    return configs
+
+
+def sweep(configs: List[dict], workers: int = None) -> pd.DataFrame:
+    fetched_configs: List[dict] = []
+    spots: List[float] = []
+    vols: List[float] = []
+    for config in configs:
+        try:
+            binom_tree = BinomialTree(config)
+        except Exception as error:
+            print(f"Skipping {config['ticker']}: {error}")
+            continue
+        fetched_configs.append(config)
+        spots.append(binom_tree.current_stock_price)
+        vols.append(binom_tree.vol)
+
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, -(-len(fetched_configs) // (workers * CHUNKS_PER_WORKER)))
+    spot_array = np.array(spots, dtype=np.float64)
+    vol_array = np.array(vols, dtype=np.float64)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_price_chunk,
+                                   fetched_configs[i:i + chunk_size],
+                                   spot_array[i:i + chunk_size],
+                                   vol_array[i:i + chunk_size])
+                   for i in range(0, len(fetched_configs), chunk_size)]
+        rows = [row for future in futures for row in future.result()]
+    return pd.DataFrame(rows)
+
+
+def parse_args() -> Tuple[List[str], int]:
     parser = argparse.ArgumentParser(description="binomial_stock_tree")
     parser.add_argument("-config",
                         type=str,
+                        nargs="+",
                         required=True,
-                        help="Config File")
+                        help="Config File(s)")
+    parser.add_argument("-workers",
+                        type=int,
+                        default=None,
+                        help="Worker processes for multi-ticker runs (defaults to all cores)")
     args = parser.parse_args()
-    return args.config
+    return args.config, args.workers
 
 
 def main():
-    config = parse_args()
+    config_paths, workers = parse_args()
+    configs = load_configs(config_paths)
 
-    with open(config) as conf:
-        params = json.load(conf)
+    if len(configs) > 1:
+        table = sweep(configs, workers)
+        print(table.to_string(index=False))
+        table.to_csv(f"binomial_sweep_{datetime.now().strftime('%Y-%m-%d_%H:%M:%S')}.csv", index=False)
+        return
 
+    params = configs[0]
     binom_tree = BinomialTree(params)
     binom_tree.export()
 
+    if "strike_price" in params:
+        print(binom_tree.price(params["strike_price"],
+                               params["option_type"],
+                               params["exercise"]))
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,173 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from models import LatticeModel
+from pricing import OptionPricer, AMERICAN
+from typing import Any, Dict, Sequence, Tuple
+
+MIN_VOL = 1e-3
+MAX_VOL = 5.
+VEGA_BUMP = 1e-3
+VEGA_FLOOR = 1e-8
+ANCHOR_STRIDE = 8
+
+
+def market_prices(quotes: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    bid = pd.to_numeric(quotes["Bid"], errors="coerce").to_numpy(dtype=np.float64)
+    ask = pd.to_numeric(quotes["Ask"], errors="coerce").to_numpy(dtype=np.float64)
+    last = pd.to_numeric(quotes["Last Price"], errors="coerce").to_numpy(dtype=np.float64)
+    mid = np.where((bid > 0.) & (ask > 0.), (bid + ask) / 2., last)
+    return pd.to_numeric(quotes["Strike"], errors="coerce").to_numpy(dtype=np.float64), mid
+
+
+class ImpliedVolSolver:
+    def __init__(self,
+                 model: LatticeModel,
+                 spot: float,
+                 risk_free_rate: float,
+                 steps: int,
+                 exercise: str = AMERICAN,
+                 price_tolerance: float = 1e-6,
+                 vol_tolerance: float = 1e-6,
+                 max_iterations: int = 50) -> None:
+        self.model = model
+        self.spot = spot
+        self.risk_free_rate = risk_free_rate
+        self.steps = steps
+        self.exercise = exercise
+        self.price_tolerance = price_tolerance
+        self.vol_tolerance = vol_tolerance
+        self.max_iterations = max_iterations
+        self.pricings = 0
+
+    def _min_vol(self, expiry: float) -> float:
+        return max(MIN_VOL, 2. * abs(self.risk_free_rate) * np.sqrt(expiry / self.steps))
+
+    def _price(self,
+               vols: np.ndarray,
+               strikes: np.ndarray,
+               option_types: np.ndarray,
+               expiry: float) -> np.ndarray:
+        self.pricings += 1
+        lattice = self.model.build(self.spot, vols, self.risk_free_rate, expiry, self.steps, strikes)
+        return OptionPricer(lattice, self.risk_free_rate, expiry).price_many(strikes, option_types, self.exercise)["price"]
+
+    def _solve_group(self,
+                     strikes: np.ndarray,
+                     option_types: np.ndarray,
+                     targets: np.ndarray,
+                     expiry: float,
+                     guess: np.ndarray) -> Dict[str, np.ndarray]:
+        count = len(strikes)
+        low = np.full(count, self._min_vol(expiry))
+        high = np.full(count, MAX_VOL)
+        bounds = self._price(np.concatenate([low, high]),
+                             np.tile(strikes, 2),
+                             np.tile(option_types, 2),
+                             expiry)
+        attainable = (targets >= bounds[:count]) & (targets <= bounds[count:])
+
+        vols = np.clip(guess, low, high)
+        errors = np.full(count, np.nan)
+        iterations = np.zeros(count, dtype=np.int64)
+        converged = np.zeros(count, dtype=bool)
+        active = attainable.copy()
+        for iteration in range(1, self.max_iterations + 1):
+            if not active.any():
+                break
+            index = np.flatnonzero(active)
+            current = vols[index]
+            priced = self._price(np.concatenate([current, current + VEGA_BUMP]),
+                                 np.tile(strikes[index], 2),
+                                 np.tile(option_types[index], 2),
+                                 expiry)
+            price, bumped = priced[:len(index)], priced[len(index):]
+            error = price - targets[index]
+            errors[index] = error
+            iterations[index] = iteration
+
+            high[index] = np.where(error > 0., current, high[index])
+            low[index] = np.where(error < 0., current, low[index])
+            done = (np.abs(error) < self.price_tolerance) | (high[index] - low[index] < self.vol_tolerance)
+
+            vega = (bumped - price) / VEGA_BUMP
+            with np.errstate(divide="ignore", invalid="ignore"):
+                newton = current - error / vega
+            bisection = (low[index] + high[index]) / 2.
+            use_newton = (vega > VEGA_FLOOR) & (newton > low[index]) & (newton < high[index])
+            vols[index] = np.where(done, current, np.where(use_newton, newton, bisection))
+
+            converged[index[done]] = True
+            active[index[done]] = False
+
+        return {
+            "vols": np.where(converged, vols, np.nan),
+            "errors": errors,
+            "iterations": iterations,
+            "converged": converged,
+            "attainable": attainable
+        }
+
+    def _warm_start(self,
+                    strikes: np.ndarray,
+                    option_types: np.ndarray,
+                    targets: np.ndarray,
+                    expiry: float) -> np.ndarray:
+        seed = np.clip(np.sqrt(2. * np.pi / expiry) * targets / self.spot, self._min_vol(expiry), MAX_VOL)
+        if len(strikes) <= 2 * ANCHOR_STRIDE:
+            return seed
+        order = np.argsort(strikes, kind="mergesort")
+        anchors = np.unique(np.append(order[::ANCHOR_STRIDE], order[-1]))
+        solved = self._solve_group(strikes[anchors], option_types[anchors], targets[anchors], expiry, seed[anchors])
+        if not solved["converged"].any():
+            return seed
+        anchor_strikes = strikes[anchors][solved["converged"]]
+        anchor_vols = solved["vols"][solved["converged"]]
+        anchor_order = np.argsort(anchor_strikes, kind="mergesort")
+        return np.interp(strikes, anchor_strikes[anchor_order], anchor_vols[anchor_order])
+
+    def solve(self,
+              strikes: Sequence[float],
+              expiries: Sequence[float],
+              option_types: Sequence[str],
+              prices: Sequence[float]) -> Tuple[np.ndarray, Dict[str, Any]]:
+        started = time.perf_counter()
+        self.pricings = 0
+        strikes = np.asarray(strikes, dtype=np.float64)
+        expiries = np.asarray(expiries, dtype=np.float64)
+        option_types = np.asarray(option_types)
+        targets = np.asarray(prices, dtype=np.float64)
+        if not strikes.shape == expiries.shape == option_types.shape == targets.shape:
+            raise ValueError("strikes, expiries, option_types and prices must have the same length")
+
+        vols = np.full(strikes.shape, np.nan)
+        errors = np.full(strikes.shape, np.nan)
+        iterations = np.zeros(strikes.shape, dtype=np.int64)
+        converged = np.zeros(strikes.shape, dtype=bool)
+        attainable = np.zeros(strikes.shape, dtype=bool)
+        quoted = np.isfinite(targets) & np.isfinite(strikes)
+        for expiry in np.unique(expiries[quoted]):
+            index = np.flatnonzero(quoted & (expiries == expiry))
+            guess = self._warm_start(strikes[index], option_types[index], targets[index], float(expiry))
+            solved = self._solve_group(strikes[index], option_types[index], targets[index], float(expiry), guess)
+            vols[index] = solved["vols"]
+            errors[index] = solved["errors"]
+            iterations[index] = solved["iterations"]
+            converged[index] = solved["converged"]
+            attainable[index] = solved["attainable"]
+
+        report = {
+            "options": int(strikes.size),
+            "converged": int(converged.sum()),
+            "unquoted": int((~quoted).sum()),
+            "outside_bounds": int((quoted & ~attainable).sum()),
+            "not_converged": int((attainable & ~converged).sum()),
+            "max_iterations": int(iterations.max()) if iterations.size else 0,
+            "mean_iterations": float(iterations[converged].mean()) if converged.any() else 0.,
+            "max_abs_price_error": float(np.abs(errors[converged]).max()) if converged.any() else np.nan,
+            "lattice_pricings": self.pricings,
+            "elapsed_seconds": time.perf_counter() - started
+        }
+        return vols, report
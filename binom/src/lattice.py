@@ -0,0 +1,104 @@
+import numpy as np
+
+from typing import Tuple
+
+
+def binomial_pmf(n: int, prob: float) -> np.ndarray:
+    mode = min(int((n + 1) * prob), n)
+    ks = np.arange(n, dtype=np.float64)
+    ratios = (n - ks) / (ks + 1.) * (prob / (1. - prob))
+    weights = np.empty(n + 1)
+    weights[mode] = 1.
+    weights[mode + 1:] = np.cumprod(ratios[mode:])
+    weights[:mode] = np.cumprod(1. / ratios[:mode][::-1])[::-1]
+    return weights / weights.sum()
+
+
+def trinomial_pmf(n: int, probs: Tuple[float, ...]) -> np.ndarray:
+    size = 2 * n + 1
+    fft_size = 1 << (size - 1).bit_length()
+    spectrum = np.fft.rfft(np.asarray(probs, dtype=np.float64), fft_size) ** n
+    weights = np.clip(np.fft.irfft(spectrum, fft_size)[:size], 0., None)
+    return weights / weights.sum()
+
+
+class Lattice:
+    branches = 1
+
+    def __init__(self,
+                 spot: float,
+                 up: float,
+                 down: float,
+                 probs: Tuple[float, ...],
+                 steps: int) -> None:
+        if len(probs) != self.branches + 1:
+            raise ValueError(f"{type(self).__name__} needs {self.branches + 1} branch probabilities, got {len(probs)}")
+        if not all(np.all((0. < prob) & (prob < 1.)) for prob in probs):
+            raise ValueError(f"Branch probabilities must lie strictly between 0 and 1, got {probs}")
+        if not np.all(down < up):
+            raise ValueError(f"up factor ({up}) must be greater than down factor ({down})")
+        self.spot = spot
+        self.up = up
+        self.down = down
+        self.probs = probs
+        self.steps = steps
+        self._log_spot = np.log(spot)
+        self._log_up = np.log(up)
+        self._log_ratio = (np.log(down) - self._log_up) / self.branches
+        self._nodes = np.arange(self.width(steps), dtype=np.float64)
+
+    @property
+    def stacked(self) -> bool:
+        return np.ndim(self._log_up) > 0
+
+    def width(self, step: int) -> int:
+        return self.branches * step + 1
+
+    def prices(self, step: int) -> np.ndarray:
+        return np.exp(self._log_spot + step * self._log_up
+                      + np.multiply.outer(self._nodes[:self.width(step)], self._log_ratio))
+
+    def probabilities(self, step: int) -> np.ndarray:
+        raise NotImplementedError
+
+    def step_back(self, values: np.ndarray, discount: float = 1.) -> np.ndarray:
+        width = len(values) - self.branches
+        stepped = (discount * self.probs[0]) * values[:width]
+        for branch, prob in enumerate(self.probs[1:], 1):
+            stepped += (discount * prob) * values[branch:branch + width]
+        return stepped
+
+    def price_matrix(self) -> np.ndarray:
+        steps = np.arange(self.steps + 1, dtype=np.float64)[:, None]
+        nodes = self._nodes[None, :]
+        prices = self.spot * self.up ** steps * np.exp(nodes * self._log_ratio)
+        return np.where(nodes <= self.branches * steps, prices, 0.)
+
+    def probability_matrix(self) -> np.ndarray:
+        probabilities = np.zeros((self.steps + 1, self.width(self.steps)))
+        for step in range(self.steps + 1):
+            probabilities[step, :self.width(step)] = self.probabilities(step)
+        return probabilities
+
+
+class BinomialLattice(Lattice):
+    branches = 1
+
+    def __init__(self,
+                 spot: float,
+                 up: float,
+                 down: float,
+                 prob: float,
+                 steps: int) -> None:
+        super().__init__(spot, up, down, (prob, 1. - prob), steps)
+        self.prob = prob
+
+    def probabilities(self, step: int) -> np.ndarray:
+        return binomial_pmf(step, 1. - self.prob)
+
+
+class TrinomialLattice(Lattice):
+    branches = 2
+
+    def probabilities(self, step: int) -> np.ndarray:
+        return trinomial_pmf(step, self.probs)
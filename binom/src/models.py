@@ -0,0 +1,125 @@
+import numpy as np
+
+from lattice import Lattice, BinomialLattice, TrinomialLattice
+from typing import Dict, Optional, Tuple, Type
+
+CRR = "crr"
+JARROW_RUDD = "jarrow_rudd"
+LEISEN_REIMER = "leisen_reimer"
+TRINOMIAL = "trinomial"
+
+PEIZER_PRATT_PROB_FLOOR = 1e-15
+
+
+class LatticeModel:
+    name = ""
+    strike_dependent = False
+
+    def build(self,
+              spot: float,
+              vol: float,
+              risk_free_rate: float,
+              time_period: float,
+              steps: int,
+              strike: Optional[float] = None) -> Lattice:
+        raise NotImplementedError
+
+
+class CoxRossRubinstein(LatticeModel):
+    name = CRR
+
+    def __init__(self, prob: Optional[float] = None) -> None:
+        self.prob = prob
+
+    def build(self,
+              spot: float,
+              vol: float,
+              risk_free_rate: float,
+              time_period: float,
+              steps: int,
+              strike: Optional[float] = None) -> Lattice:
+        at = time_period / steps
+        up = np.exp(vol * np.sqrt(at))
+        down = 1. / up
+        prob = (np.exp(risk_free_rate * at) - down) / (up - down) if self.prob is None else self.prob
+        return BinomialLattice(spot, up, down, prob, steps)
+
+
+class JarrowRudd(LatticeModel):
+    name = JARROW_RUDD
+
+    def build(self,
+              spot: float,
+              vol: float,
+              risk_free_rate: float,
+              time_period: float,
+              steps: int,
+              strike: Optional[float] = None) -> Lattice:
+        at = time_period / steps
+        drift = (risk_free_rate - vol ** 2 / 2.) * at
+        up = np.exp(drift + vol * np.sqrt(at))
+        down = np.exp(drift - vol * np.sqrt(at))
+        return BinomialLattice(spot, up, down, 0.5, steps)
+
+
+class LeisenReimer(LatticeModel):
+    name = LEISEN_REIMER
+    strike_dependent = True
+
+    @staticmethod
+    def _log_peizer_pratt(z: float, steps: int) -> Tuple[float, float]:
+        spread = z / (steps + 1. / 3. + 0.1 / (steps + 1.))
+        exponent = spread ** 2 * (steps + 1. / 6.)
+        log_tail = np.log(0.25) - exponent - np.log(0.5 + np.sqrt(0.25 - 0.25 * np.exp(-exponent)))
+        log_body = np.log1p(-np.exp(log_tail))
+        return np.where(z >= 0., log_body, log_tail), np.where(z >= 0., log_tail, log_body)
+
+    def build(self,
+              spot: float,
+              vol: float,
+              risk_free_rate: float,
+              time_period: float,
+              steps: int,
+              strike: Optional[float] = None) -> Lattice:
+        if strike is None:
+            raise ValueError("The Leisen-Reimer lattice is centred on the strike and needs one")
+        steps += 1 - steps % 2
+        at = time_period / steps
+        d1 = (np.log(spot / strike) + (risk_free_rate + vol ** 2 / 2.) * time_period) / (vol * np.sqrt(time_period))
+        d2 = d1 - vol * np.sqrt(time_period)
+        log_prob, log_prob_complement = self._log_peizer_pratt(d2, steps)
+        log_prob_bar, log_prob_bar_complement = self._log_peizer_pratt(d1, steps)
+        up = np.exp(risk_free_rate * at + log_prob_bar - log_prob)
+        down = np.exp(risk_free_rate * at + log_prob_bar_complement - log_prob_complement)
+        prob = np.clip(np.exp(log_prob), PEIZER_PRATT_PROB_FLOOR, 1. - PEIZER_PRATT_PROB_FLOOR)
+        return BinomialLattice(spot, up, down, prob, steps)
+
+
+class Trinomial(LatticeModel):
+    name = TRINOMIAL
+
+    def build(self,
+              spot: float,
+              vol: float,
+              risk_free_rate: float,
+              time_period: float,
+              steps: int,
+              strike: Optional[float] = None) -> Lattice:
+        at = time_period / steps
+        half_up = np.exp(vol * np.sqrt(at / 2.))
+        half_down = 1. / half_up
+        growth = np.exp(risk_free_rate * at / 2.)
+        p_up = ((growth - half_down) / (half_up - half_down)) ** 2
+        p_down = ((half_up - growth) / (half_up - half_down)) ** 2
+        return TrinomialLattice(spot, half_up ** 2, half_down ** 2, (p_up, 1. - p_up - p_down, p_down), steps)
+
+
+MODELS: Dict[str, Type[LatticeModel]] = {
+    model.name: model for model in (CoxRossRubinstein, JarrowRudd, LeisenReimer, Trinomial)
+}
+
+
+def get_model(name: str) -> LatticeModel:
+    if name not in MODELS:
+        raise ValueError(f"Unknown lattice model: {name}")
+    return MODELS[name]()
@@ -0,0 +1,97 @@
+import os
+import json
+import pandas as pd
+
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".binom_cache")
+DATE_FORMAT = "%Y-%m-%d"
+PRICE_COLUMN = "Adj Close"
+
+
+class PriceCache:
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR) -> None:
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, ticker: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, f"{ticker.upper()}_{suffix}")
+
+    @staticmethod
+    def _write_atomic(path: str, write: Callable[[str], None]) -> None:
+        tmp_path = path + ".tmp"
+        write(tmp_path)
+        os.replace(tmp_path, path)
+
+    def _load_meta(self, ticker: str) -> Dict[str, Any]:
+        path = self._path(ticker, "meta.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path) as meta_file:
+            return json.load(meta_file)
+
+    def _save_meta(self, ticker: str, meta: Dict[str, Any]) -> None:
+        def write(path: str) -> None:
+            with open(path, "w") as meta_file:
+                json.dump(meta, meta_file)
+        self._write_atomic(self._path(ticker, "meta.json"), write)
+
+    def _load_prices(self, ticker: str) -> pd.Series:
+        path = self._path(ticker, "prices.csv")
+        if not os.path.exists(path):
+            return pd.Series(name=PRICE_COLUMN, dtype="float64", index=pd.DatetimeIndex([]))
+        return pd.read_csv(path, index_col=0, parse_dates=True)[PRICE_COLUMN]
+
+    def _save_prices(self, ticker: str, prices: pd.Series) -> None:
+        self._write_atomic(self._path(ticker, "prices.csv"),
+                           lambda path: prices.to_frame(PRICE_COLUMN).to_csv(path))
+
+    def get_prices(self,
+                   ticker: str,
+                   start: datetime,
+                   end: datetime,
+                   download: Callable[[datetime, datetime], pd.Series]) -> pd.DataFrame:
+        start_day = pd.Timestamp(start.strftime(DATE_FORMAT))
+        end_day = pd.Timestamp(end.strftime(DATE_FORMAT))
+        meta = self._load_meta(ticker)
+        prices = self._load_prices(ticker)
+
+        fetched_from = pd.Timestamp(meta.get("fetched_from", start_day))
+        fetched_through = pd.Timestamp(meta.get("fetched_through", start_day))
+        missing: List[Tuple[pd.Timestamp, pd.Timestamp]] = []
+        if "fetched_from" not in meta:
+            missing.append((start_day, end_day))
+        else:
+            if start_day < fetched_from:
+                missing.append((start_day, fetched_from))
+            if end_day > fetched_through:
+                missing.append((fetched_through, end_day))
+
+        if missing:
+            downloaded = [download(first, last) for first, last in missing]
+            prices = pd.concat([prices] + downloaded)
+            prices = prices[~prices.index.duplicated(keep="last")].sort_index().rename(PRICE_COLUMN)
+            self._save_prices(ticker, prices)
+            meta["fetched_from"] = min(start_day, fetched_from).strftime(DATE_FORMAT)
+            meta["fetched_through"] = max(end_day, fetched_through).strftime(DATE_FORMAT)
+            self._save_meta(ticker, meta)
+
+        window = prices[(prices.index >= start_day) & (prices.index < end_day)]
+        return window.to_frame(PRICE_COLUMN)
+
+    def get_sigma(self, ticker: str, model: str, as_of: str) -> Optional[float]:
+        return self._load_meta(ticker).get("sigmas", {}).get(model, {}).get(as_of)
+
+    def set_sigma(self, ticker: str, model: str, as_of: str, sigma: float) -> None:
+        meta = self._load_meta(ticker)
+        meta.setdefault("sigmas", {}).setdefault(model, {})[as_of] = sigma
+        self._save_meta(ticker, meta)
+
+    def get_params(self, ticker: str, model: str) -> Optional[List[float]]:
+        return self._load_meta(ticker).get("params", {}).get(model)
+
+    def set_params(self, ticker: str, model: str, params: List[float]) -> None:
+        meta = self._load_meta(ticker)
+        meta.setdefault("params", {})[model] = params
+        self._save_meta(ticker, meta)
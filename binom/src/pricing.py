@@ -0,0 +1,144 @@
+import numpy as np
+
+from lattice import Lattice
+from typing import Callable, Dict, List, Sequence
+
+CALL = "call"
+PUT = "put"
+EUROPEAN = "european"
+AMERICAN = "american"
+
+OPTION_SIGNS = {CALL: 1., PUT: -1.}
+EXERCISE_STYLES = (EUROPEAN, AMERICAN)
+RESULT_KEYS = ("price", "delta", "gamma", "theta")
+
+
+class OptionPricer:
+    def __init__(self,
+                 lattice: Lattice,
+                 risk_free_rate: float,
+                 time_period: float) -> None:
+        self.lattice = lattice
+        self.risk_free_rate = risk_free_rate
+        self.time_period = time_period
+        self.at = time_period / lattice.steps
+        self.gamma_step = 2 // lattice.branches
+
+    @staticmethod
+    def _get_signs(option_types: np.ndarray) -> np.ndarray:
+        unknown = set(option_types.tolist()) - set(OPTION_SIGNS)
+        if unknown:
+            raise ValueError(f"Unknown option type(s): {sorted(unknown)}")
+        return np.where(option_types == CALL, OPTION_SIGNS[CALL], OPTION_SIGNS[PUT])
+
+    def _get_greeks(self,
+                    first: np.ndarray,
+                    second: np.ndarray,
+                    price: np.ndarray) -> Dict[str, np.ndarray]:
+        if self.lattice.steps < self.gamma_step:
+            return {key: np.full_like(price, np.nan) for key in RESULT_KEYS[1:]}
+        prices_1 = self.lattice.prices(1)
+        prices_2 = self.lattice.prices(self.gamma_step)
+        delta_up = (second[0] - second[1]) / (prices_2[0] - prices_2[1])
+        delta_down = (second[1] - second[2]) / (prices_2[1] - prices_2[2])
+        delta = (first[0] - first[-1]) / (prices_1[0] - prices_1[-1])
+        gamma = (delta_up - delta_down) / ((prices_2[0] - prices_2[2]) / 2.)
+        drift = prices_2[1] - self.lattice.spot
+        return {
+            "delta": delta,
+            "gamma": gamma,
+            "theta": (second[1] - price - delta * drift - gamma * drift ** 2 / 2.) / (self.gamma_step * self.at)
+        }
+
+    def _prices(self, step: int) -> np.ndarray:
+        prices = self.lattice.prices(step)
+        return prices.reshape(len(prices), -1)
+
+    def _induct(self,
+                payoffs: np.ndarray,
+                signs: np.ndarray,
+                strikes: np.ndarray,
+                discount: float,
+                american: bool) -> List[np.ndarray]:
+        values = first = second = payoffs
+        for step in range(self.lattice.steps - 1, -1, -1):
+            values = self.lattice.step_back(values, discount)
+            if american:
+                np.maximum(values, signs * (self._prices(step) - strikes), out=values)
+            if step == self.gamma_step:
+                second = values
+            if step == 1:
+                first = values
+        return [values, first, second]
+
+    def _expect(self,
+                payoffs: np.ndarray,
+                discount: float) -> List[np.ndarray]:
+        slices = []
+        for step in range(min(self.lattice.steps, 2) + 1):
+            remaining = self.lattice.steps - step
+            weights = self.lattice.probabilities(remaining) * discount ** remaining
+            slices.append(np.stack([weights @ payoffs[node:node + len(weights)]
+                                    for node in range(self.lattice.width(step))]))
+        slices += [slices[-1]] * (3 - len(slices))
+        return [slices[0], slices[1], slices[self.gamma_step]]
+
+    def price_many(self,
+                   strikes: Sequence[float],
+                   option_types: Sequence[str],
+                   exercise: str = EUROPEAN) -> Dict[str, np.ndarray]:
+        if exercise not in EXERCISE_STYLES:
+            raise ValueError(f"Unknown exercise style: {exercise}")
+        strikes = np.asarray(strikes, dtype=np.float64)
+        signs = self._get_signs(np.asarray(option_types))
+        discount = np.exp(-self.risk_free_rate * self.at)
+        payoffs = np.maximum(signs * (self._prices(self.lattice.steps) - strikes), 0.)
+
+        if exercise == AMERICAN or self.lattice.stacked:
+            values, first, second = self._induct(payoffs, signs, strikes, discount, exercise == AMERICAN)
+        else:
+            values, first, second = self._expect(payoffs, discount)
+
+        result = {"price": values[0]}
+        result.update(self._get_greeks(first, second, values[0]))
+        return result
+
+    def price(self,
+              strike: float,
+              option_type: str = CALL,
+              exercise: str = EUROPEAN) -> Dict[str, float]:
+        result = self.price_many([strike], [option_type], exercise)
+        return {key: float(value[0]) for key, value in result.items()}
+
+
+class ChainPricer:
+    def __init__(self,
+                 lattice_factory: Callable[[float, float], Lattice],
+                 risk_free_rate: float,
+                 strike_dependent: bool = False) -> None:
+        self.lattice_factory = lattice_factory
+        self.risk_free_rate = risk_free_rate
+        self.strike_dependent = strike_dependent
+
+    def price(self,
+              strikes: Sequence[float],
+              expiries: Sequence[float],
+              option_types: Sequence[str],
+              exercise: str = EUROPEAN) -> Dict[str, np.ndarray]:
+        strikes = np.asarray(strikes, dtype=np.float64)
+        expiries = np.asarray(expiries, dtype=np.float64)
+        option_types = np.asarray(option_types)
+        if not strikes.shape == expiries.shape == option_types.shape:
+            raise ValueError("strikes, expiries and option_types must have the same length")
+
+        chain = {key: np.full(strikes.shape, np.nan) for key in RESULT_KEYS}
+        for expiry in np.unique(expiries):
+            expiry_mask = expiries == expiry
+            groups = [expiry_mask & (strikes == strike) for strike in np.unique(strikes[expiry_mask])] \
+                if self.strike_dependent else [expiry_mask]
+            for mask in groups:
+                lattice = self.lattice_factory(float(expiry), float(strikes[mask][0]))
+                pricer = OptionPricer(lattice, self.risk_free_rate, float(expiry))
+                for key, values in pricer.price_many(strikes[mask], option_types[mask], exercise).items():
+                    chain[key][mask] = values
+        return chain
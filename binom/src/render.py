@@ -0,0 +1,120 @@
+import io
+import imgkit
+
+import numpy as np
+import pandas as pd
+
+from lattice import Lattice
+from typing import IO, Dict, Iterator, Optional, Tuple, Type
+
+HTML_STYLE = "table {font-size: 20px; border-collapse: separate; border-spacing: 50px 50px;}"
+SVG_COLUMN_WIDTH = 110
+SVG_ROW_HEIGHT = 36
+SVG_MARGIN = 20
+
+
+def select_indices(count: int, limit: Optional[int]) -> np.ndarray:
+    if limit is None or count <= limit + 1:
+        return np.arange(count)
+    return np.unique(np.linspace(0, count - 1, limit + 1).round().astype(np.int64))
+
+
+class LatticeExporter:
+    extension = ""
+
+    def __init__(self, decimals: int, max_steps: Optional[int] = None) -> None:
+        self.decimals = decimals
+        self.max_steps = max_steps
+
+    def rows(self, lattice: Lattice) -> Iterator[Tuple[int, np.ndarray, np.ndarray, np.ndarray]]:
+        for step in select_indices(lattice.steps + 1, self.max_steps).tolist():
+            nodes = select_indices(lattice.width(step), self.max_steps)
+            yield step, nodes, lattice.prices(step)[nodes], lattice.probabilities(step)[nodes]
+
+    def formatted(self, lattice: Lattice) -> Iterator[Tuple[int, np.ndarray, np.ndarray, np.ndarray]]:
+        for step, nodes, prices, probabilities in self.rows(lattice):
+            yield step, nodes, np.round(prices, self.decimals), np.round(probabilities * 100, self.decimals)
+
+    def packed(self, lattice: Lattice) -> Dict[str, np.ndarray]:
+        rows = list(self.rows(lattice))
+        return {
+            "step": np.concatenate([np.full(len(nodes), step) for step, nodes, _, _ in rows]),
+            "node": np.concatenate([nodes for _, nodes, _, _ in rows]),
+            "price": np.concatenate([prices for _, _, prices, _ in rows]),
+            "probability": np.concatenate([probabilities for _, _, _, probabilities in rows])
+        }
+
+    def export(self, lattice: Lattice, path: str) -> None:
+        raise NotImplementedError
+
+
+class HtmlExporter(LatticeExporter):
+    extension = "html"
+
+    def write(self, lattice: Lattice, out: IO[str]) -> None:
+        out.write(f"<html><head><style>{HTML_STYLE}</style></head><body><table>\n")
+        for step, _, prices, probabilities in self.formatted(lattice):
+            cells = "".join(f"<td>({price}, {probability})</td>" for price, probability in zip(prices, probabilities))
+            out.write(f"<tr><th>{step}</th>{cells}</tr>\n")
+        out.write("</table></body></html>\n")
+
+    def export(self, lattice: Lattice, path: str) -> None:
+        with open(path, "w") as out:
+            self.write(lattice, out)
+
+
+class PngExporter(HtmlExporter):
+    extension = "png"
+
+    def export(self, lattice: Lattice, path: str) -> None:
+        out = io.StringIO()
+        self.write(lattice, out)
+        imgkit.from_string(out.getvalue(), path)
+
+
+class SvgExporter(LatticeExporter):
+    extension = "svg"
+
+    def export(self, lattice: Lattice, path: str) -> None:
+        rendered_steps = len(select_indices(lattice.steps + 1, self.max_steps))
+        rendered_nodes = len(select_indices(lattice.width(lattice.steps), self.max_steps))
+        width = rendered_steps * SVG_COLUMN_WIDTH + 2 * SVG_MARGIN
+        height = rendered_nodes * SVG_ROW_HEIGHT + 2 * SVG_MARGIN
+        middle = height / 2.
+        with open(path, "w") as out:
+            out.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                      f'font-family="sans-serif" font-size="11">\n')
+            for column, (step, nodes, prices, probabilities) in enumerate(self.formatted(lattice)):
+                x = SVG_MARGIN + column * SVG_COLUMN_WIDTH
+                spread = (len(nodes) - 1) * SVG_ROW_HEIGHT / 2.
+                for row, (price, probability) in enumerate(zip(prices, probabilities)):
+                    y = middle - spread + row * SVG_ROW_HEIGHT
+                    out.write(f'<text x="{x}" y="{y:.1f}">{price}</text>'
+                              f'<text x="{x}" y="{y + 12:.1f}" fill="#888">{probability}%</text>\n')
+            out.write("</svg>\n")
+
+
+class NpzExporter(LatticeExporter):
+    extension = "npz"
+
+    def export(self, lattice: Lattice, path: str) -> None:
+        np.savez_compressed(path, **self.packed(lattice))
+
+
+class ParquetExporter(LatticeExporter):
+    extension = "parquet"
+
+    def export(self, lattice: Lattice, path: str) -> None:
+        pd.DataFrame(self.packed(lattice)).to_parquet(path, index=False)
+
+
+EXPORTERS: Dict[str, Type[LatticeExporter]] = {
+    exporter.extension: exporter
+    for exporter in (HtmlExporter, PngExporter, SvgExporter, NpzExporter, ParquetExporter)
+}
+
+
+def get_exporter(export_format: str, decimals: int, max_steps: Optional[int] = None) -> LatticeExporter:
+    if export_format not in EXPORTERS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    return EXPORTERS[export_format](decimals, max_steps)
@@ -0,0 +1,46 @@
+import pytest
+import numpy as np
+
+from models import MODELS
+from pricing import ChainPricer
+from implied_vol import ImpliedVolSolver
+
+SPOT, RATE, STEPS = 100., 0.05, 100
+
+
+def smile(strikes: np.ndarray) -> np.ndarray:
+    return 0.2 + 0.5 * ((strikes - SPOT) / SPOT) ** 2
+
+
+def quote(model: str, strikes: np.ndarray, expiries: np.ndarray, option_types: np.ndarray, exercise: str) -> np.ndarray:
+    prices = []
+    for strike, expiry, option_type, vol in zip(strikes, expiries, option_types, smile(strikes)):
+        lattice_factory = lambda time_period, strike, vol=vol: MODELS[model]().build(SPOT, vol, RATE, time_period,
+                                                                                     STEPS, strike)
+        prices.append(ChainPricer(lattice_factory, RATE).price([strike], [expiry], [option_type], exercise)["price"][0])
+    return np.array(prices)
+
+
+@pytest.mark.parametrize("model", sorted(MODELS))
+@pytest.mark.parametrize("exercise", ["european", "american"])
+def test_solver_recovers_lattice_vols(model, exercise):
+    strikes = np.linspace(80., 120., 40)
+    expiries = np.repeat([0.25, 1.], 20)
+    option_types = np.where(strikes < SPOT, "put", "call")
+    prices = quote(model, strikes, expiries, option_types, exercise)
+
+    vols, report = ImpliedVolSolver(MODELS[model](), SPOT, RATE, STEPS, exercise).solve(strikes, expiries,
+                                                                                        option_types, prices)
+    assert report["converged"] == len(strikes)
+    assert vols == pytest.approx(smile(strikes), abs=1e-4)
+    assert report["lattice_pricings"] < len(strikes)
+
+
+def test_unquoted_and_unattainable_prices_are_reported():
+    strikes = np.array([90., 100., 110.])
+    vols, report = ImpliedVolSolver(MODELS["crr"](), SPOT, RATE, STEPS).solve(strikes, [1.] * 3, ["call"] * 3,
+                                                                            [np.nan, 200., 5.])
+    assert np.isnan(vols[:2]).all() and np.isfinite(vols[2])
+    assert report["unquoted"] == 1
+    assert report["outside_bounds"] == 1
+    assert report["converged"] == 1
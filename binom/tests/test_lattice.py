@@ -0,0 +1,45 @@
+import math
+import pytest
+import numpy as np
+
+from fractions import Fraction
+from lattice import BinomialLattice, binomial_pmf
+
+
+def exact_pmf(n: int, prob: float) -> list:
+    p = Fraction(prob)
+    return [float(Fraction(math.factorial(n), math.factorial(k) * math.factorial(n - k)) * p ** k * (1 - p) ** (n - k))
+            for k in range(n + 1)]
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 5, 12, 40])
+@pytest.mark.parametrize("prob", [0.01, 0.25, 0.5, 0.6180339887, 0.999])
+def test_binomial_pmf_matches_exact_rationals(n, prob):
+    np.testing.assert_allclose(binomial_pmf(n, prob), exact_pmf(n, prob), rtol=1e-13, atol=0)
+
+
+@pytest.mark.parametrize("prob", [0.3, 0.5, 0.5017])
+def test_binomial_pmf_is_stable_at_50k_steps(prob):
+    n = 50000
+    pmf = binomial_pmf(n, prob)
+    ks = np.arange(n + 1)
+    assert np.all(np.isfinite(pmf)) and np.all(pmf >= 0.)
+    assert pmf.sum() == pytest.approx(1., abs=1e-12)
+    assert pmf @ ks == pytest.approx(n * prob, rel=1e-12)
+    for k in (int(n * prob) - 500, int(n * prob), int(n * prob) + 321):
+        log_exact = math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1) \
+            + k * math.log(prob) + (n - k) * math.log1p(-prob)
+        assert pmf[k] == pytest.approx(math.exp(log_exact), rel=1e-8)
+
+
+def test_lattice_rows_match_closed_form():
+    steps, up, prob = 12, 1.09, 0.45
+    lattice = BinomialLattice(250., up, 1. / up, prob, steps)
+    prices = lattice.price_matrix()
+    probabilities = lattice.probability_matrix()
+    for step in range(steps + 1):
+        downs = np.arange(step + 1)
+        np.testing.assert_allclose(lattice.prices(step), 250. * up ** (step - downs) * (1. / up) ** downs)
+        np.testing.assert_allclose(prices[step, :step + 1], lattice.prices(step))
+        np.testing.assert_allclose(probabilities[step, :step + 1], exact_pmf(step, 1. - prob), rtol=1e-13)
+        assert probabilities[step].sum() == pytest.approx(1.)
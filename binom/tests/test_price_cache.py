@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from datetime import datetime
+from price_cache import PriceCache, PRICE_COLUMN
+
+
+class StubDownload:
+    def __init__(self, offset=0.):
+        self.offset = offset
+        self.calls = []
+
+    def __call__(self, first, last):
+        self.calls.append((first, last))
+        dates = pd.bdate_range(first, last)
+        dates = dates[dates < last]
+        return pd.Series([date.day + self.offset for date in dates], index=dates, name=PRICE_COLUMN)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PriceCache(str(tmp_path))
+
+
+def test_same_day_call_downloads_nothing(cache):
+    download = StubDownload()
+    first = cache.get_prices("aapl", datetime(2020, 7, 1, 9), datetime(2020, 7, 31, 9), download)
+    second = cache.get_prices("AAPL", datetime(2020, 7, 1, 17), datetime(2020, 7, 31, 17), download)
+
+    assert download.calls == [(pd.Timestamp("2020-07-01"), pd.Timestamp("2020-07-31"))]
+    pd.testing.assert_frame_equal(first, second)
+    assert second.index[0] == pd.Timestamp("2020-07-01")
+    assert second.index[-1] == pd.Timestamp("2020-07-30")
+
+
+def test_wider_window_fetches_only_the_edges(cache):
+    download = StubDownload()
+    cache.get_prices("AAPL", datetime(2020, 7, 6), datetime(2020, 7, 20), download)
+    prices = cache.get_prices("AAPL", datetime(2020, 7, 1), datetime(2020, 7, 31), download)
+
+    assert download.calls[1:] == [(pd.Timestamp("2020-07-01"), pd.Timestamp("2020-07-06")),
+                                  (pd.Timestamp("2020-07-20"), pd.Timestamp("2020-07-31"))]
+    assert list(prices.index) == list(pd.bdate_range("2020-07-01", "2020-07-30"))
+    assert not prices.index.duplicated().any()
+    assert cache.get_prices("AAPL", datetime(2020, 7, 2), datetime(2020, 7, 30), download).index[-1] \
+        == pd.Timestamp("2020-07-29")
+    assert len(download.calls) == 3
+
+
+def test_overlapping_download_keeps_the_latest_price(cache):
+    cache.get_prices("AAPL", datetime(2020, 7, 6), datetime(2020, 7, 10), StubDownload())
+    revised = StubDownload(offset=100.)
+
+    def revised_download(first, last):
+        return revised(first - pd.Timedelta(days=1), last)
+
+    prices = cache.get_prices("AAPL", datetime(2020, 7, 6), datetime(2020, 7, 14), revised_download)
+
+    assert prices[PRICE_COLUMN].tolist() == [6., 7., 8., 109., 110., 113.]
+
+
+def test_sigma_and_params_memo(tmp_path, cache):
+    assert cache.get_sigma("AAPL", "garch", "2020-07-31") is None
+    cache.set_sigma("AAPL", "garch", "2020-07-31", 0.3)
+    cache.set_params("AAPL", "garch", [0.1, 0.2, 0.7])
+    cache.set_sigma("AAPL", "garch", "2020-08-03", 0.4)
+
+    reopened = PriceCache(str(tmp_path))
+    assert reopened.get_sigma("aapl", "garch", "2020-07-31") == 0.3
+    assert reopened.get_sigma("AAPL", "garch", "2020-08-03") == 0.4
+    assert reopened.get_sigma("AAPL", "egarch", "2020-07-31") is None
+    assert reopened.get_params("AAPL", "garch") == [0.1, 0.2, 0.7]
+    assert reopened.get_params("MSFT", "garch") is None
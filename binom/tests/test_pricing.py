@@ -0,0 +1,55 @@
+import math
+import pytest
+import numpy as np
+
+from models import MODELS
+from pricing import OptionPricer, ChainPricer
+
+SPOT, STRIKE, RATE, TIME_PERIOD, VOL = 100., 110., 0.05, 1., 0.25
+
+
+def black_scholes(option_type: str) -> float:
+    cdf = lambda x: 0.5 * (1. + math.erf(x / math.sqrt(2.)))
+    d1 = (math.log(SPOT / STRIKE) + (RATE + VOL ** 2 / 2.) * TIME_PERIOD) / (VOL * math.sqrt(TIME_PERIOD))
+    d2 = d1 - VOL * math.sqrt(TIME_PERIOD)
+    call = SPOT * cdf(d1) - STRIKE * math.exp(-RATE * TIME_PERIOD) * cdf(d2)
+    return call if option_type == "call" else call - SPOT + STRIKE * math.exp(-RATE * TIME_PERIOD)
+
+
+@pytest.mark.parametrize("model", sorted(MODELS))
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_european_prices_converge_to_black_scholes(model, option_type):
+    lattice = MODELS[model]().build(SPOT, VOL, RATE, TIME_PERIOD, 1001, STRIKE)
+    result = OptionPricer(lattice, RATE, TIME_PERIOD).price(STRIKE, option_type, "european")
+    assert result["price"] == pytest.approx(black_scholes(option_type), abs=5e-3)
+
+
+@pytest.mark.parametrize("model", sorted(MODELS))
+def test_expectation_matches_backward_induction(model):
+    lattice = MODELS[model]().build(SPOT, VOL, RATE, TIME_PERIOD, 64, STRIKE)
+    pricer = OptionPricer(lattice, RATE, TIME_PERIOD)
+    discount = np.exp(-RATE * pricer.at)
+    values = np.maximum(lattice.prices(lattice.steps) - STRIKE, 0.)
+    for _ in range(lattice.steps):
+        values = lattice.step_back(values, discount)
+    assert pricer.price(STRIKE, "call", "european")["price"] == pytest.approx(values[0], rel=1e-10)
+
+
+def test_american_put_is_worth_at_least_european():
+    lattice = MODELS["crr"]().build(SPOT, VOL, RATE, TIME_PERIOD, 500)
+    pricer = OptionPricer(lattice, RATE, TIME_PERIOD)
+    assert pricer.price(STRIKE, "put", "american")["price"] > pricer.price(STRIKE, "put", "european")["price"]
+
+
+@pytest.mark.parametrize("exercise", ["european", "american"])
+def test_chain_matches_single_pricings(exercise):
+    model = MODELS["crr"]()
+    strikes = np.array([90., 100., 110., 100.])
+    expiries = np.array([0.5, 0.5, 1., 1.])
+    option_types = np.array(["call", "put", "put", "call"])
+    chain = ChainPricer(lambda expiry, strike: model.build(SPOT, VOL, RATE, expiry, 200, strike), RATE) \
+        .price(strikes, expiries, option_types, exercise)
+    for i, (strike, expiry, option_type) in enumerate(zip(strikes, expiries, option_types)):
+        single = OptionPricer(model.build(SPOT, VOL, RATE, expiry, 200), RATE, expiry).price(strike, option_type, exercise)
+        for key, value in single.items():
+            assert chain[key][i] == pytest.approx(value, rel=1e-10)
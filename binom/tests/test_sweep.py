@@ -0,0 +1,38 @@
+import pytest
+
+binomial_tree = pytest.importorskip("binomial_tree")
+
+SPOTS = {"AAPL": 115., "MSFT": 205., "TSLA": 420.}
+CONFIG = {
+    "number_of_binomial_steps": 200,
+    "lattice_model": "crr",
+    "risk_free_rate": 0.05,
+    "tickers": [
+        {"ticker": "AAPL", "strike_price": 120., "option_type": "call"},
+        {"ticker": "MSFT", "strike_price": 200., "option_type": "put"},
+        {"ticker": "TSLA", "strike_price": 450., "option_type": "put"}
+    ],
+    "exercise": "american",
+    "time_period_in_years": 0.5,
+    "auto_volatility": False,
+    "volatility_estimate": 0.4,
+    "auto_p": True,
+    "p_estimate": 0.4,
+    "round_up_decimals": 2
+}
+
+
+def test_sweep_matches_serial_pricing(tmp_path, monkeypatch):
+    monkeypatch.setattr(binomial_tree.BinomialTree, "_get_mid_price", lambda self: SPOTS[self.ticker])
+    path = tmp_path / "sweep.json"
+    path.write_text(binomial_tree.json.dumps(CONFIG))
+    configs = binomial_tree.load_configs([str(path)])
+
+    table = binomial_tree.sweep(configs, workers=2).set_index("ticker")
+    assert list(table.index) == list(SPOTS)
+    for config in configs:
+        serial = binomial_tree.BinomialTree(config).price(config["strike_price"],
+                                                          config["option_type"],
+                                                          config["exercise"])
+        assert table.loc[config["ticker"], "price"] == pytest.approx(serial["price"], rel=1e-12)
+        assert table.loc[config["ticker"], "spot"] == SPOTS[config["ticker"]]
@@ -12,7 +12,13 @@ import dash_core_components as dcc
 import dash_bootstrap_components as dbc
 import dash_html_components as html
 
-from yahooquery import Ticker
+from history import get_provider
+from history_cache import HistoryCache, DEFAULT_TTL, DEFAULT_MAX_ENTRIES
+from correlation import StreamingCorrelation
+from preprocess import prepare, correlate, PEARSON, DEFAULT_BAR_SIZE, DEFAULT_FILL_LIMIT, DEFAULT_MIN_COVERAGE
+from baskets import BasketRegistry, normalize, DEFAULT_IDLE_SECONDS
+from scheduler import SnapshotScheduler, DEFAULT_REFRESH_SECONDS
+from universe import neighbour_rows, DENSE, UNIVERSE, DEFAULT_TOP_K, DEFAULT_BLOCK_SIZE, NEIGHBOUR_COLUMNS
 from dash.dependencies import Input, Output, State
 
 VALID_USERNAME_PASSWORD_PAIRS = {
@@ -29,6 +35,9 @@ auth = dash_auth.BasicAuth(
 )
 
 MAX_COL_WIDTH = 300
+DEFAULT_UI_POLL_SECONDS = 300
+DEFAULT_PORT = 5000
+DEFAULT_WAITRESS_THREADS = 4
 
 def parse_args() -> str:
     parser = argparse.ArgumentParser(description="correlation matrix")
@@ -42,10 +51,28 @@ config = parse_args()
 with open(config) as conf:
     params = json.load(conf)
 
-ticks = sorted(params["tickers"])
-ticks.insert(0, "Tickers")
-cols = ticks
-current_tickers = ticks[1:]
+default_tickers = normalize(params["tickers"])
+baskets = BasketRegistry(default_tickers, params.get("basket_idle_seconds", DEFAULT_IDLE_SECONDS))
+history_cache = HistoryCache(get_provider(params),
+                             params.get("cache_ttl", DEFAULT_TTL),
+                             params.get("cache_max_entries", DEFAULT_MAX_ENTRIES))
+correlation_engines = {}
+matrix_mode = params.get("matrix_mode", DENSE)
+matrix_output_dir = params.get("matrix_output_dir", "matrices")
+top_k = params.get("top_k", DEFAULT_TOP_K)
+block_size = params.get("block_size", DEFAULT_BLOCK_SIZE)
+bar_size = params.get("bar_size", DEFAULT_BAR_SIZE)
+fill_limit = params.get("fill_limit", DEFAULT_FILL_LIMIT)
+min_coverage = params.get("min_coverage", DEFAULT_MIN_COVERAGE)
+correlation_method = params.get("correlation_method", PEARSON)
+ewm_halflife = params.get("ewm_halflife")
+
+
+def table_columns(tickers: list) -> list:
+    if matrix_mode == UNIVERSE:
+        return NEIGHBOUR_COLUMNS
+    return ["Tickers"] + tickers
+
 
 matrix_alert = dbc.Alert("Matrix", color="light", id="mat")
 lookback_alert = dbc.Alert("Lookback Period", color="light", id="lookback")
@@ -81,27 +108,32 @@ form = dbc.Form(
 )
 
 @app.callback(
-    Output("tickbody", "children"),
-    [Input("ticker-button", "n_clicks"),
-    Input("addin", "value"),
-    Input("removein", "value")],
+    Output("tickers-store", "data"),
+    [Input("ticker-button", "n_clicks")],
+    [State("addin", "value"),
+     State("removein", "value"),
+     State("tickers-store", "data")],
 )
-def update_tickers(n, addin, removein):
-    callback = dash.callback_context.triggered[0]["prop_id"]
-    if "addin" not in callback and "removein" not in callback:
-        if n:
-            if n > 0:
-                if addin:
-                    if len(addin) > 0 and addin not in current_tickers and len(addin) + 1 <= 9:
-                        current_tickers.append(addin)
-                        current_tickers.sort()
-                if removein:
-                    if len(removein) > 0 and removein in current_tickers:
-                        current_tickers.remove(removein)
-                        current_tickers.sort()
-                return [html.P(", ".join(current_tickers))]
-    else:
+def update_tickers(n, addin, removein, tickers):
+    if not n:
         raise dash.exceptions.PreventUpdate
+    tickers = set(tickers or default_tickers)
+    if addin:
+        tickers.update(normalize([addin]))
+    if removein:
+        tickers.difference_update(normalize([removein]))
+    tickers = sorted(tickers)
+    if baskets.touch(tickers):
+        scheduler.request_refresh()
+    return tickers
+
+
+@app.callback(
+    Output("tickbody", "children"),
+    [Input("tickers-store", "data")],
+)
+def show_tickers(tickers):
+    return [html.P(", ".join(tickers or default_tickers))]
 
 
 popover = html.Div(
@@ -140,7 +172,7 @@ tick_popover = html.Div(
         dbc.Popover(
             [
                 dbc.PopoverHeader("Current tickers: "),
-                dbc.PopoverBody(", ".join(current_tickers), id="tickbody"),
+                dbc.PopoverBody(", ".join(default_tickers), id="tickbody"),
             ],
             id="tick_popover",
             is_open=False,
@@ -169,8 +201,9 @@ app.layout = html.Div([dbc.Jumbotron([
                             className="lead",
                         ),dbc.Spinner(html.Div(id="loading-output")),]),
                 popover,
+                dcc.Store(id="tickers-store", storage_type="session", data=default_tickers),
                 dcc.Interval(id='graph-update',
-                             interval=1*300000,
+                             interval=1000*params.get("ui_poll_seconds", DEFAULT_UI_POLL_SECONDS),
                              n_intervals=0),
     tick_popover,
     form,
@@ -193,8 +226,8 @@ app.layout = html.Div([dbc.Jumbotron([
                         "font_size": "20px",
                         "text_align": "center"
                         },
-                         columns=[{"name": i, "id": i} for i in ["Tickers"] + current_tickers],
-                         data=[{"Tickers": cols[i+1]} for i in range(len(cols)-1)]),
+                         columns=[{"name": i, "id": i} for i in table_columns(default_tickers)],
+                         data=[{"Tickers": ticker} for ticker in default_tickers]),
     html.Div(json.dumps({"n_clicks":0,
                       "n_previous_clicks":0}),
                        id="local_data",
@@ -219,41 +252,65 @@ def track_submit_clicks(n_clicks,
                          "n_previous_clicks": n_previous_clicks})
     return json.dumps(local_data)
 
+def compute_snapshot(period: str) -> dict:
+    history = history_cache.get(baskets.union(), "1h", period)
+    if matrix_mode == UNIVERSE:
+        returns = prepare(history, bar_size, fill_limit, min_coverage)
+        rows = neighbour_rows(returns, matrix_output_dir, f"correlation_{period}", top_k, block_size,
+                              correlation_method, ewm_halflife)
+        return {"rows": {row["Tickers"]: row for row in rows}}
+    returns = prepare(history, bar_size, fill_limit, min_coverage, dense=False)
+    if correlation_method == PEARSON:
+        engine = correlation_engines.setdefault(period, StreamingCorrelation())
+        engine.update(returns)
+        return {"matrix": engine.correlation()}
+    return {"returns": returns}
+
+
+def basket_view(snapshot: dict, tickers: list) -> tuple:
+    if matrix_mode == UNIVERSE:
+        rows = snapshot["rows"]
+        return [rows[ticker] for ticker in tickers if ticker in rows], NEIGHBOUR_COLUMNS
+    if "returns" in snapshot:
+        basket = [ticker for ticker in tickers if ticker in snapshot["returns"].columns]
+        corr_df = correlate(snapshot["returns"][basket].dropna(), correlation_method, ewm_halflife)
+    else:
+        corr_df = snapshot["matrix"]
+    present = [ticker for ticker in tickers if ticker in corr_df.index]
+    corr_df = corr_df.loc[present, present]
+    matrix = corr_df.to_dict('records')
+    for i in range(len(matrix)):
+        matrix[i]["Tickers"] = corr_df.index[i]
+    return matrix, table_columns(present)
+
+
+scheduler = SnapshotScheduler(compute_snapshot, opts, params.get("refresh_seconds", DEFAULT_REFRESH_SECONDS))
+scheduler.start()
+
+
 @app.callback([Output('my-table', 'data'),
               Output("body", "children"),
               Output("loading-output", "children"),
                Output('my-table', 'columns')],
               [Input('graph-update', 'n_intervals'),
                Input("local_data", "children"),
-               Input("select", "value")])
-def update_table(n, local_data_json, period):
-    callback = dash.callback_context.triggered[0]["prop_id"]
+               Input("select", "value"),
+               Input("tickers-store", "data")])
+def update_table(n, local_data_json, period, tickers):
+    tickers = tickers or default_tickers
     local_data = json.loads(local_data_json)
-    n_clicks = local_data["n_clicks"]
-    n_previous_clicks = local_data["n_previous_clicks"]
-    if (n > 0 or (n_clicks > n_previous_clicks)) and "date_input" not in callback and "select" not in callback and period:
-        tickers = []
-        for symbol in current_tickers:
-            ticker = Ticker(symbol.lower())
-            row = ticker.history(interval='1h', period=period)
-            row["Symbol"] = symbol
-            tickers.append(row)
-        df = pd.concat(tickers)
-        df = df.reset_index()
-        df = df[["date", "close", "Symbol"]]
-        df_pivot = df.pivot("date", "Symbol", "close").reset_index()
-        corr_df = df_pivot.corr(method="pearson")
-        corr_df.head().reset_index()
-        matrix = corr_df.to_dict('records')
-        for i, element in enumerate(matrix):
-            element = dict(sorted(element.items()))
-        for i in range(len(matrix)):
-            matrix[i]["Tickers"] = list(current_tickers[i])
-        last_update_time = time.strftime("%Y-%m-%d %H:%M:%S")
-        return matrix, [html.P(last_update_time)], "", [{"name": i, "id": i} for i in ["Tickers"] + current_tickers]
-    else:
+    triggered = [trigger["prop_id"] for trigger in dash.callback_context.triggered]
+    clicked = "local_data.children" in triggered and local_data["n_clicks"] > local_data["n_previous_clicks"]
+    if baskets.touch(tickers) or clicked:
+        scheduler.request_refresh()
+    snapshot = scheduler.get(period) if period else None
+    if snapshot is None:
         raise dash.exceptions.PreventUpdate
+    matrix, columns = basket_view(snapshot, tickers)
+    return matrix, [html.P(snapshot["refreshed_at"])], "", [{"name": i, "id": i} for i in columns]
 
 if __name__ == "__main__":
     from waitress import serve
-    serve(server, host="0.0.0.0", port=5000)
+    serve(server, host="0.0.0.0",
+          port=params.get("port", DEFAULT_PORT),
+          threads=params.get("waitress_threads", DEFAULT_WAITRESS_THREADS))
@@ -0,0 +1,43 @@
+import time
+import threading
+
+from typing import Dict, FrozenSet, List
+
+DEFAULT_IDLE_SECONDS = 1800.
+
+
+def normalize(tickers: List[str]) -> List[str]:
+    return sorted({ticker.strip().upper() for ticker in tickers if ticker and ticker.strip()})
+
+
+class BasketRegistry:
+    def __init__(self, defaults: List[str], idle_seconds: float = DEFAULT_IDLE_SECONDS) -> None:
+        self.defaults = normalize(defaults)
+        self.idle_seconds = idle_seconds
+        self._baskets: Dict[FrozenSet[str], float] = {}
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        for basket in [basket for basket, seen in self._baskets.items() if now - seen > self.idle_seconds]:
+            del self._baskets[basket]
+
+    def _union(self) -> FrozenSet[str]:
+        return frozenset(self.defaults).union(*self._baskets)
+
+    def touch(self, tickers: List[str]) -> bool:
+        basket = frozenset(normalize(tickers))
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            grows = not basket <= self._union()
+            self._baskets[basket] = now
+            return grows
+
+    def union(self) -> List[str]:
+        with self._lock:
+            self._expire(time.time())
+            return sorted(self._union())
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"baskets": len(self._baskets), "tickers": len(self._union())}
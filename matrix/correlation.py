@@ -0,0 +1,148 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+REBUILD_INTERVAL = 10000
+
+
+def _grow(matrix: np.ndarray, row: np.ndarray, col: np.ndarray, corner: float) -> np.ndarray:
+    grown = np.pad(matrix, ((0, 1), (0, 1)))
+    grown[-1, :-1] = row
+    grown[:-1, -1] = col
+    grown[-1, -1] = corner
+    return grown
+
+
+class StreamingCorrelation:
+    def __init__(self, window: Optional[int] = None) -> None:
+        self.window = window
+        self.symbols: List[str] = []
+        self._dates: Deque[pd.Timestamp] = deque()
+        self._rows: Deque[np.ndarray] = deque()
+        self._shift = np.empty(0)
+        self._count = np.zeros((0, 0))
+        self._sum = np.zeros((0, 0))
+        self._square = np.zeros((0, 0))
+        self._cross = np.zeros((0, 0))
+        self._updates = 0
+        self._lock = threading.RLock()
+
+    def _centred(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        present = ~np.isnan(rows)
+        return np.where(present, rows - self._shift, 0.), present.astype(np.float64)
+
+    def _accumulate(self, rows: np.ndarray, sign: float) -> None:
+        centred, mask = self._centred(rows)
+        self._count += sign * (mask.T @ mask)
+        self._sum += sign * (centred.T @ mask)
+        self._square += sign * ((centred ** 2).T @ mask)
+        self._cross += sign * (centred.T @ centred)
+        self._updates += len(rows)
+
+    def _stacked(self) -> np.ndarray:
+        return np.vstack(self._rows) if self._rows else np.empty((0, len(self.symbols)))
+
+    def rebuild(self) -> None:
+        size = len(self.symbols)
+        self._count, self._sum, self._square, self._cross = (np.zeros((size, size)) for _ in range(4))
+        self._accumulate(self._stacked(), 1.)
+        self._updates = 0
+
+    def _evict(self, oldest: Optional[pd.Timestamp]) -> None:
+        expired = []
+        while self._dates and ((self.window is not None and len(self._dates) > self.window)
+                               or (oldest is not None and self._dates[0] < oldest)):
+            self._dates.popleft()
+            expired.append(self._rows.popleft())
+        if expired:
+            self._accumulate(np.vstack(expired), -1.)
+
+    def push(self, date: pd.Timestamp, row: np.ndarray) -> None:
+        row = np.asarray(row, dtype=np.float64)
+        with self._lock:
+            if self._dates and date < self._dates[-1]:
+                return
+            if self._dates and date == self._dates[-1]:
+                self._accumulate(self._rows[-1][None, :], -1.)
+                self._rows[-1] = row
+            else:
+                self._dates.append(date)
+                self._rows.append(row)
+            self._accumulate(row[None, :], 1.)
+            self._evict(None)
+
+    def add_symbol(self, symbol: str, closes: pd.Series) -> None:
+        values = closes.reindex(list(self._dates)).to_numpy(dtype=np.float64)
+        observed = closes.dropna()
+        self.symbols.append(symbol)
+        self._shift = np.append(self._shift, observed.iloc[0] if len(observed) else 0.)
+        self._rows = deque(np.append(row, value) for row, value in zip(self._rows, values))
+
+        centred, mask = self._centred(self._stacked())
+        existing, existing_mask = centred[:, :-1], mask[:, :-1]
+        column, column_mask = centred[:, -1], mask[:, -1]
+        self._count = _grow(self._count, column_mask @ existing_mask, existing_mask.T @ column_mask,
+                            column_mask.sum())
+        self._sum = _grow(self._sum, column @ existing_mask, existing.T @ column_mask, column.sum())
+        self._square = _grow(self._square, column ** 2 @ existing_mask, (existing ** 2).T @ column_mask,
+                             (column ** 2).sum())
+        self._cross = _grow(self._cross, column @ existing, existing.T @ column, column @ column)
+
+    def remove_symbol(self, symbol: str) -> None:
+        index = self.symbols.index(symbol)
+        del self.symbols[index]
+        self._shift = np.delete(self._shift, index)
+        self._rows = deque(np.delete(row, index) for row in self._rows)
+        self._count, self._sum, self._square, self._cross = (
+            np.delete(np.delete(matrix, index, axis=0), index, axis=1)
+            for matrix in (self._count, self._sum, self._square, self._cross)
+        )
+
+    def _rewritten(self, aligned: pd.DataFrame) -> bool:
+        dates = pd.DatetimeIndex(list(self._dates))
+        kept = dates >= aligned.index[0] if len(aligned.index) else np.zeros(len(dates), dtype=bool)
+        incoming = aligned[(aligned.index >= dates[0]) & (aligned.index <= dates[-1])]
+        if not incoming.index.equals(dates[kept]):
+            return True
+        values, rows = incoming.to_numpy(dtype=np.float64)[:-1], self._stacked()[kept][:-1]
+        return not ((values == rows) | (np.isnan(values) & np.isnan(rows))).all()
+
+    def update(self, closes: pd.DataFrame) -> None:
+        with self._lock:
+            for symbol in [symbol for symbol in self.symbols if symbol not in closes.columns]:
+                self.remove_symbol(symbol)
+            for symbol in [symbol for symbol in closes.columns if symbol not in self.symbols]:
+                self.add_symbol(symbol, closes[symbol])
+
+            aligned = closes.reindex(columns=self.symbols).sort_index()
+            if self._dates and self._rewritten(aligned):
+                self._dates.clear()
+                self._rows.clear()
+            if not self._dates:
+                self._dates.extend(aligned.index)
+                self._rows.extend(aligned.to_numpy(dtype=np.float64))
+                self.rebuild()
+            else:
+                aligned = aligned[aligned.index >= self._dates[-1]]
+                for date, row in zip(aligned.index, aligned.to_numpy(dtype=np.float64)):
+                    self.push(date, row)
+            self._evict(closes.index.min() if len(closes.index) else None)
+            if self._updates >= REBUILD_INTERVAL:
+                self.rebuild()
+
+    def correlation(self) -> pd.DataFrame:
+        with self._lock:
+            count, total, square, cross = self._count, self._sum, self._square, self._cross
+            with np.errstate(divide="ignore", invalid="ignore"):
+                covariance = count * cross - total * total.T
+                variance = count * square - total ** 2
+                correlation = np.clip(covariance / np.sqrt(variance * variance.T), -1., 1.)
+            correlation[(count < 2) | (variance <= 0.) | (variance.T <= 0.)] = np.nan
+            np.fill_diagonal(correlation, np.where(np.diag(variance) > 0., 1., np.nan))
+            order = np.argsort(self.symbols, kind="mergesort")
+            symbols = [self.symbols[index] for index in order]
+            return pd.DataFrame(correlation[np.ix_(order, order)], index=symbols, columns=symbols)
@@ -0,0 +1,254 @@
+import os
+import time
+import threading
+import requests
+import requests.adapters
+
+import pandas as pd
+
+from bar_store import BarStore, to_nanoseconds
+from yahooquery import Ticker
+from typing import Any, Dict, List, Optional, Tuple, Type
+from concurrent.futures import ThreadPoolExecutor
+
+HISTORY_COLUMNS = ["date", "close", "Symbol"]
+YAHOO_CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart"
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TIMEOUT = 10.
+DEFAULT_FIXTURE_DIR = "fixtures"
+DEFAULT_REPLAY_LATENCY = 0.
+SECONDS_PER_DAY = 86400.
+REFRESH_PERIODS = [("1d", 1), ("5d", 5), ("1mo", 28), ("3mo", 90), ("6mo", 180), ("1y", 365), ("2y", 730)]
+PERIOD_DAYS = {"1d": 1, "5d": 5, "7d": 7, "60d": 60, "1mo": 31, "3mo": 92, "6mo": 183,
+               "1y": 366, "2y": 731, "5y": 1827, "10y": 3653}
+
+
+def empty_history() -> pd.DataFrame:
+    return pd.DataFrame(columns=HISTORY_COLUMNS)
+
+
+def refresh_period(elapsed_seconds: float) -> Optional[str]:
+    for period, days in REFRESH_PERIODS:
+        if elapsed_seconds < days * SECONDS_PER_DAY:
+            return period
+    return None
+
+
+def fixture_path(fixture_dir: str, symbol: str, interval: str) -> str:
+    return os.path.join(fixture_dir, interval, f"{symbol}.csv")
+
+
+def period_start(period: str, now: pd.Timestamp) -> Optional[pd.Timestamp]:
+    if period == "max":
+        return None
+    if period == "ytd":
+        return now.normalize().replace(month=1, day=1)
+    return now - pd.Timedelta(days=PERIOD_DAYS[period])
+
+
+class HistoryProvider:
+    name = ""
+
+    def __init__(self,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 timeout: float = DEFAULT_TIMEOUT) -> None:
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+    def fetch(self, symbols: List[str], interval: str, period: str) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class YahooQueryProvider(HistoryProvider):
+    name = "yahooquery"
+
+    def fetch(self, symbols: List[str], interval: str, period: str) -> pd.DataFrame:
+        if not symbols:
+            return empty_history()
+        labels = {symbol.lower(): symbol for symbol in symbols}
+        ticker = Ticker(list(labels),
+                        asynchronous=True,
+                        max_workers=self.max_workers,
+                        timeout=self.timeout)
+        history = ticker.history(interval=interval, period=period)
+        if isinstance(history, pd.DataFrame):
+            frames = {symbol: frame for symbol, frame in history.groupby(level=0)}
+        else:
+            frames = {symbol: frame for symbol, frame in history.items() if isinstance(frame, pd.DataFrame)}
+
+        rows = []
+        for symbol, frame in frames.items():
+            if frame.empty or "close" not in frame:
+                print(f"No {interval} history for {symbol} over {period}")
+                continue
+            row = frame.reset_index()[["date", "close"] + (["adjclose"] if "adjclose" in frame else [])]
+            row["Symbol"] = labels.get(symbol.lower(), symbol)
+            rows.append(row)
+        return pd.concat(rows, ignore_index=True) if rows else empty_history()
+
+
+class ChartApiProvider(HistoryProvider):
+    name = "chart_api"
+
+    def __init__(self,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 url: str = YAHOO_CHART_URL) -> None:
+        super().__init__(max_workers, timeout)
+        self.url = url.rstrip("/")
+        self.session = requests.Session()
+        self.session.mount(self.url, requests.adapters.HTTPAdapter(pool_maxsize=max_workers))
+
+    def _fetch_one(self, symbol: str, interval: str, period: str) -> pd.DataFrame:
+        try:
+            response = self.session.get(f"{self.url}/{symbol}",
+                                        params={"interval": interval, "range": period},
+                                        timeout=self.timeout)
+            response.raise_for_status()
+            result = response.json()["chart"]["result"][0]
+            return pd.DataFrame({
+                "date": pd.to_datetime(result["timestamp"], unit="s"),
+                "close": result["indicators"]["quote"][0]["close"],
+                "Symbol": symbol
+            }).dropna()
+        except (requests.RequestException, ValueError, KeyError, IndexError, TypeError) as error:
+            print(f"Failed to fetch {interval} history for {symbol} over {period}: {error}")
+            return empty_history()
+
+    def fetch(self, symbols: List[str], interval: str, period: str) -> pd.DataFrame:
+        if not symbols:
+            return empty_history()
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(symbols))) as executor:
+            rows = list(executor.map(lambda symbol: self._fetch_one(symbol, interval, period), symbols))
+        return pd.concat(rows, ignore_index=True)
+
+
+class ReplayProvider(HistoryProvider):
+    name = "replay"
+
+    def __init__(self,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 fixture_dir: str = DEFAULT_FIXTURE_DIR,
+                 latency: float = DEFAULT_REPLAY_LATENCY) -> None:
+        super().__init__(max_workers, timeout)
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+        self._fixtures: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def _fixture(self, symbol: str, interval: str) -> pd.DataFrame:
+        key = (symbol, interval)
+        with self._lock:
+            if key not in self._fixtures:
+                path = fixture_path(self.fixture_dir, symbol, interval)
+                self._fixtures[key] = pd.read_csv(path, parse_dates=["date"]) if os.path.exists(path) else empty_history()
+            return self._fixtures[key]
+
+    def fetch(self, symbols: List[str], interval: str, period: str) -> pd.DataFrame:
+        if self.latency:
+            time.sleep(self.latency)
+        rows = []
+        for symbol in symbols:
+            bars = self._fixture(symbol, interval)
+            if bars.empty:
+                print(f"No {interval} fixture for {symbol}")
+                continue
+            start = period_start(period, bars["date"].iloc[-1])
+            rows.append(bars[bars["date"] >= start] if start is not None else bars)
+        return pd.concat(rows, ignore_index=True) if rows else empty_history()
+
+
+class RecordingProvider(HistoryProvider):
+    def __init__(self, provider: HistoryProvider, fixture_dir: str = DEFAULT_FIXTURE_DIR) -> None:
+        super().__init__(provider.max_workers, provider.timeout)
+        self.name = provider.name
+        self.provider = provider
+        self.fixture_dir = fixture_dir
+        self._lock = threading.Lock()
+
+    def fetch(self, symbols: List[str], interval: str, period: str) -> pd.DataFrame:
+        history = self.provider.fetch(symbols, interval, period)
+        os.makedirs(os.path.join(self.fixture_dir, interval), exist_ok=True)
+        with self._lock:
+            for symbol, bars in history.groupby("Symbol"):
+                path = fixture_path(self.fixture_dir, symbol, interval)
+                if os.path.exists(path):
+                    bars = pd.concat([pd.read_csv(path, parse_dates=["date"]), bars], ignore_index=True)
+                    bars = bars.drop_duplicates("date", keep="last").sort_values("date")
+                bars[HISTORY_COLUMNS].to_csv(path, index=False)
+        return history
+
+
+class StoredHistoryProvider(HistoryProvider):
+    def __init__(self, provider: HistoryProvider, root: str) -> None:
+        super().__init__(provider.max_workers, provider.timeout)
+        self.name = provider.name
+        self.provider = provider
+        self.root = root
+        self._stores: Dict[str, BarStore] = {}
+        self._lock = threading.Lock()
+
+    def store(self, interval: str) -> BarStore:
+        with self._lock:
+            if interval not in self._stores:
+                self._stores[interval] = BarStore(self.root, interval)
+            return self._stores[interval]
+
+    def fetch(self, symbols: List[str], interval: str, period: str) -> pd.DataFrame:
+        if not symbols:
+            return empty_history()
+        store = self.store(interval)
+        now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+        start = period_start(period, now)
+        groups: Dict[str, List[str]] = {}
+        for symbol in symbols:
+            covered, last = store.covered_from(symbol), store.last(symbol)
+            gap_period = None
+            if last is not None and (start is None or covered <= start):
+                gap_period = refresh_period((now - last).total_seconds())
+            groups.setdefault(gap_period or period, []).append(symbol)
+
+        for fetch_period, group in groups.items():
+            fetched = self.provider.fetch(group, interval, fetch_period)
+            for symbol, bars in fetched.groupby("Symbol"):
+                last = store.last(symbol)
+                if fetch_period != period and last is not None:
+                    bars = bars[to_nanoseconds(bars["date"]) >= last.value]
+                store.ingest(symbol, bars, covered_from=start if fetch_period == period else None)
+
+        rows = []
+        for symbol in symbols:
+            bars = store.frame(symbol, start)
+            if bars.empty:
+                continue
+            row = bars[["close", "adjclose"]].reset_index()
+            row["Symbol"] = symbol
+            rows.append(row)
+        return pd.concat(rows, ignore_index=True) if rows else empty_history()
+
+
+PROVIDERS: Dict[str, Type[HistoryProvider]] = {
+    provider.name: provider for provider in (YahooQueryProvider, ChartApiProvider, ReplayProvider)
+}
+
+
+def get_provider(params: Dict[str, Any]) -> HistoryProvider:
+    name = params.get("history_provider", YahooQueryProvider.name)
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown history provider: {name}")
+    options = {
+        "max_workers": params.get("fetch_workers", DEFAULT_MAX_WORKERS),
+        "timeout": params.get("fetch_timeout", DEFAULT_TIMEOUT)
+    }
+    if name == ChartApiProvider.name and "history_url" in params:
+        options["url"] = params["history_url"]
+    if name == ReplayProvider.name:
+        options["fixture_dir"] = params.get("fixture_dir", DEFAULT_FIXTURE_DIR)
+        options["latency"] = params.get("replay_latency", DEFAULT_REPLAY_LATENCY)
+    provider = PROVIDERS[name](**options)
+    if params.get("record_fixtures") and name != ReplayProvider.name:
+        provider = RecordingProvider(provider, params.get("fixture_dir", DEFAULT_FIXTURE_DIR))
+    if "bar_store_dir" in params:
+        provider = StoredHistoryProvider(provider, params["bar_store_dir"])
+    return provider
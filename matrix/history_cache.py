@@ -0,0 +1,121 @@
+import time
+import threading
+
+import pandas as pd
+
+from bar_store import to_nanoseconds
+from history import HistoryProvider, empty_history, period_start, refresh_period
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_TTL = 240.
+DEFAULT_MAX_ENTRIES = 1024
+
+Key = Tuple[str, str, str]
+
+
+class CacheEntry:
+    def __init__(self, bars: pd.DataFrame) -> None:
+        self.bars = bars
+        self.fetched_at = time.time()
+
+
+class HistoryCache:
+    def __init__(self,
+                 provider: HistoryProvider,
+                 ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.provider = provider
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Key, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Key, Future] = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0, "evictions": 0}
+
+    def _store(self, key: Key, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _merge(self, key: Key, stale: Optional[CacheEntry], bars: pd.DataFrame) -> Optional[pd.DataFrame]:
+        if bars.empty:
+            return stale.bars if stale is not None else None
+        if stale is None:
+            entry = CacheEntry(bars.reset_index(drop=True))
+        else:
+            merged = pd.concat([stale.bars, bars], ignore_index=True)
+            merged = merged.drop_duplicates("date", keep="last").sort_values("date")
+            start = period_start(key[2], pd.Timestamp(merged["date"].iloc[-1]))
+            if start is not None:
+                merged = merged[to_nanoseconds(merged["date"]) >= start.value]
+            entry = CacheEntry(merged.reset_index(drop=True))
+        with self._lock:
+            self._store(key, entry)
+        return entry.bars
+
+    def _load(self, keys: List[Key], interval: str, period: str) -> Dict[Key, Optional[pd.DataFrame]]:
+        with self._lock:
+            stale = {key: self._entries[key] for key in keys if key in self._entries}
+        groups: Dict[str, List[str]] = {}
+        for key in keys:
+            entry = stale.get(key)
+            gap_period = refresh_period(time.time() - entry.fetched_at) if entry is not None else None
+            if gap_period is None:
+                stale.pop(key, None)
+            groups.setdefault(gap_period or period, []).append(key[0])
+
+        fetched = pd.concat([self.provider.fetch(symbols, interval, fetch_period)
+                             for fetch_period, symbols in groups.items()], ignore_index=True)
+        by_symbol = {symbol: bars for symbol, bars in fetched.groupby("Symbol")}
+        with self._lock:
+            self._counters["refreshes"] += len(stale)
+        return {key: self._merge(key, stale.get(key), by_symbol.get(key[0], empty_history())) for key in keys}
+
+    def get(self, symbols: List[str], interval: str, period: str) -> pd.DataFrame:
+        results: Dict[Key, Optional[pd.DataFrame]] = {}
+        waiting: Dict[Key, Future] = {}
+        owned: Dict[Key, Future] = {}
+        now = time.time()
+        with self._lock:
+            for symbol in symbols:
+                key = (symbol, interval, period)
+                entry = self._entries.get(key)
+                if entry is not None and now - entry.fetched_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    results[key] = entry.bars
+                    self._counters["hits"] += 1
+                elif key in self._inflight:
+                    waiting[key] = self._inflight[key]
+                    self._counters["coalesced"] += 1
+                else:
+                    owned[key] = self._inflight[key] = Future()
+                    self._counters["misses"] += 1
+
+        if owned:
+            try:
+                loaded = self._load(list(owned), interval, period)
+            except Exception as error:
+                for future in owned.values():
+                    future.set_exception(error)
+                raise
+            finally:
+                with self._lock:
+                    for key in owned:
+                        self._inflight.pop(key, None)
+            for key, future in owned.items():
+                future.set_result(loaded[key])
+            results.update(loaded)
+
+        for key, future in waiting.items():
+            results[key] = future.result()
+
+        frames = [bars for bars in results.values() if bars is not None]
+        return pd.concat(frames, ignore_index=True) if frames else empty_history()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._counters, entries=len(self._entries), inflight=len(self._inflight))
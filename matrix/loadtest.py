@@ -0,0 +1,230 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import requests
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+from history import get_provider, ReplayProvider, DEFAULT_FIXTURE_DIR
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+UPDATE_URL = "/_dash-update-component"
+DEFAULT_THREADS = [1, 2, 4, 8, 16]
+DEFAULT_USERS = 32
+DEFAULT_DURATION = 30.
+DEFAULT_PORT = 5050
+DEFAULT_PERIOD = "1mo"
+DEFAULT_TICKER_SHARE = 0.2
+DEFAULT_RECORD_PERIOD = "2y"
+REQUEST_TIMEOUT = 60.
+STARTUP_TIMEOUT = 300.
+TABLE_OUTPUTS = [("my-table", "data"), ("body", "children"), ("loading-output", "children"), ("my-table", "columns")]
+
+Sample = Tuple[str, float, int]
+
+
+def table_payload(n: int, period: str, tickers: List[str]) -> Dict[str, Any]:
+    inputs = [
+        {"id": "graph-update", "property": "n_intervals", "value": n},
+        {"id": "local_data", "property": "children", "value": json.dumps({"n_clicks": 0, "n_previous_clicks": 0})},
+        {"id": "select", "property": "value", "value": period},
+        {"id": "tickers-store", "property": "data", "value": tickers}
+    ]
+    return {
+        "output": "".join(f"..{component}.{prop}." for component, prop in TABLE_OUTPUTS) + ".",
+        "outputs": [{"id": component, "property": prop} for component, prop in TABLE_OUTPUTS],
+        "inputs": inputs,
+        "changedPropIds": ["graph-update.n_intervals"],
+        "state": []
+    }
+
+
+def tickers_payload(n: int, addin: Optional[str], removein: Optional[str], tickers: List[str]) -> Dict[str, Any]:
+    return {
+        "output": "tickers-store.data",
+        "outputs": {"id": "tickers-store", "property": "data"},
+        "inputs": [{"id": "ticker-button", "property": "n_clicks", "value": n}],
+        "changedPropIds": ["ticker-button.n_clicks"],
+        "state": [
+            {"id": "addin", "property": "value", "value": addin},
+            {"id": "removein", "property": "value", "value": removein},
+            {"id": "tickers-store", "property": "data", "value": tickers}
+        ]
+    }
+
+
+def post(session: requests.Session, url: str, payload: Dict[str, Any]) -> Tuple[float, int]:
+    started = time.perf_counter()
+    try:
+        status = session.post(url, json=payload, timeout=REQUEST_TIMEOUT).status_code
+    except requests.RequestException:
+        status = 0
+    return time.perf_counter() - started, status
+
+
+async def virtual_user(executor: ThreadPoolExecutor,
+                       url: str,
+                       auth: Optional[Tuple[str, str]],
+                       defaults: List[str],
+                       symbols: List[str],
+                       period: str,
+                       ticker_share: float,
+                       deadline: float,
+                       samples: List[Sample]) -> None:
+    loop = asyncio.get_event_loop()
+    session = requests.Session()
+    session.auth = auth
+    tickers = list(defaults)
+    n = 0
+    while time.perf_counter() < deadline:
+        n += 1
+        if random.random() < ticker_share:
+            addin = random.choice(symbols)
+            removein = random.choice(tickers) if len(tickers) > 2 else None
+            payload = tickers_payload(n, addin, removein, tickers)
+            latency, status = await loop.run_in_executor(executor, post, session, url, payload)
+            samples.append(("update_tickers", latency, status))
+            if status == 200:
+                tickers = sorted(set(tickers).union([addin]).difference([removein]))
+        else:
+            latency, status = await loop.run_in_executor(executor, post, session, url,
+                                                         table_payload(n, period, tickers))
+            samples.append(("update_table", latency, status))
+
+
+def run_load(url: str,
+             auth: Optional[Tuple[str, str]],
+             defaults: List[str],
+             symbols: List[str],
+             period: str,
+             users: int,
+             duration: float,
+             ticker_share: float) -> Tuple[List[Sample], float]:
+    samples: List[Sample] = []
+    started = time.perf_counter()
+    deadline = started + duration
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        tasks = [virtual_user(executor, url, auth, defaults, symbols, period, ticker_share, deadline, samples)
+                 for _ in range(users)]
+        asyncio.get_event_loop().run_until_complete(asyncio.gather(*tasks))
+    return samples, time.perf_counter() - started
+
+
+def summarize(threads: int, samples: List[Sample], elapsed: float) -> List[Dict[str, Any]]:
+    rows = []
+    frame = pd.DataFrame(samples, columns=["callback", "latency", "status"])
+    for callback, group in [("all", frame)] + list(frame.groupby("callback")):
+        latencies = group["latency"].to_numpy() * 1000.
+        rows.append({
+            "threads": threads,
+            "callback": callback,
+            "requests": len(group),
+            "errors": int((~group["status"].isin([200, 204])).sum()),
+            "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else np.nan,
+            "p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else np.nan,
+            "throughput": len(group) / elapsed
+        })
+    return rows
+
+
+def start_server(params: Dict[str, Any], workdir: str, threads: int) -> subprocess.Popen:
+    path = os.path.join(workdir, f"matrix_{threads}.json")
+    with open(path, "w") as conf:
+        json.dump(dict(params, waitress_threads=threads), conf)
+    app = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+    return subprocess.Popen([sys.executable, app, "-config", path], cwd=os.path.dirname(app))
+
+
+def wait_ready(url: str, auth: Optional[Tuple[str, str]], period: str, tickers: List[str]) -> None:
+    session = requests.Session()
+    session.auth = auth
+    deadline = time.perf_counter() + STARTUP_TIMEOUT
+    while time.perf_counter() < deadline:
+        _, status = post(session, url, table_payload(0, period, tickers))
+        if status == 200:
+            return
+        time.sleep(1.)
+    raise TimeoutError(f"No {period} snapshot from {url} after {STARTUP_TIMEOUT:.0f}s")
+
+
+def record(params: Dict[str, Any], symbols: List[str], fixture_dir: str) -> None:
+    live = {key: value for key, value in params.items() if key != "bar_store_dir"}
+    provider = get_provider(dict(live, record_fixtures=True, fixture_dir=fixture_dir))
+    history = provider.fetch(symbols, "1h", DEFAULT_RECORD_PERIOD)
+    print(f"Recorded {len(history)} bars for {history['Symbol'].nunique()} symbols to {fixture_dir}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="correlation matrix load test")
+    parser.add_argument("-config", type=str, required=True,
+                        help="Config file")
+    parser.add_argument("-fixtures", type=str, default=DEFAULT_FIXTURE_DIR,
+                        help="Recorded history directory")
+    parser.add_argument("-record", action="store_true",
+                        help="Record fixtures from the live provider and exit")
+    parser.add_argument("-symbols", type=str, nargs="*", default=[],
+                        help="Extra tickers to record and add during the test")
+    parser.add_argument("-threads", type=int, nargs="+", default=DEFAULT_THREADS,
+                        help="Waitress thread counts to test")
+    parser.add_argument("-users", type=int, default=DEFAULT_USERS,
+                        help="Concurrent virtual users")
+    parser.add_argument("-duration", type=float, default=DEFAULT_DURATION,
+                        help="Seconds of load per thread count")
+    parser.add_argument("-period", type=str, default=DEFAULT_PERIOD,
+                        help="Lookback period requested by update_table")
+    parser.add_argument("-ticker_share", type=float, default=DEFAULT_TICKER_SHARE,
+                        help="Share of requests that call update_tickers")
+    parser.add_argument("-port", type=int, default=DEFAULT_PORT,
+                        help="Port for the app under test")
+    parser.add_argument("-auth", type=str, default=None,
+                        help="Basic auth as user:password")
+    parser.add_argument("-output", type=str, default=None,
+                        help="CSV file for the results")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    with open(args.config) as conf:
+        params = json.load(conf)
+    defaults = sorted({ticker.upper() for ticker in params["tickers"]})
+    symbols = sorted(set(defaults).union(symbol.upper() for symbol in args.symbols))
+    if args.record:
+        record(params, symbols, args.fixtures)
+        return
+
+    auth = tuple(args.auth.split(":", 1)) if args.auth else None
+    url = f"http://127.0.0.1:{args.port}{UPDATE_URL}"
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        replay = {key: value for key, value in params.items() if key not in ("bar_store_dir", "record_fixtures")}
+        replay.update(history_provider=ReplayProvider.name,
+                      fixture_dir=os.path.abspath(args.fixtures),
+                      matrix_output_dir=os.path.join(workdir, "matrices"),
+                      port=args.port)
+        for threads in args.threads:
+            server = start_server(replay, workdir, threads)
+            try:
+                wait_ready(url, auth, args.period, defaults)
+                samples, elapsed = run_load(url, auth, defaults, symbols, args.period,
+                                            args.users, args.duration, args.ticker_share)
+                results += summarize(threads, samples, elapsed)
+            finally:
+                server.terminate()
+                server.wait()
+
+    report = pd.DataFrame(results)
+    print(report.to_string(index=False, float_format=lambda value: f"{value:.1f}"))
+    if args.output:
+        report.to_csv(args.output, index=False)
+
+if __name__ == "__main__":
+    main()
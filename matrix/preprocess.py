@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from typing import List, Optional, Tuple
+
+PEARSON = "pearson"
+SPEARMAN = "spearman"
+EWM = "ewm"
+CORRELATION_METHODS = (PEARSON, SPEARMAN, EWM)
+DEFAULT_BAR_SIZE = "1h"
+DEFAULT_FILL_LIMIT = 3
+DEFAULT_MIN_COVERAGE = 0.8
+DEFAULT_HALFLIFE = 24.
+
+
+def align(history: pd.DataFrame, bar_size: str = DEFAULT_BAR_SIZE) -> pd.DataFrame:
+    dates = pd.to_datetime(history["date"], utc=True).dt.floor(bar_size)
+    closes = history.assign(date=dates).groupby(["date", "Symbol"])["close"].last().unstack()
+    return closes.resample(bar_size).last().dropna(how="all")
+
+
+def log_returns(closes: pd.DataFrame,
+                fill_limit: int = DEFAULT_FILL_LIMIT,
+                min_coverage: float = DEFAULT_MIN_COVERAGE,
+                dense: bool = True) -> pd.DataFrame:
+    filled = closes.ffill(limit=fill_limit)
+    returns = np.log(filled.where(filled > 0.)).diff().iloc[1:]
+    returns = returns.loc[:, returns.notna().mean() >= min_coverage]
+    return returns.dropna() if dense else returns
+
+
+def prepare(history: pd.DataFrame,
+            bar_size: str = DEFAULT_BAR_SIZE,
+            fill_limit: int = DEFAULT_FILL_LIMIT,
+            min_coverage: float = DEFAULT_MIN_COVERAGE,
+            dense: bool = True) -> pd.DataFrame:
+    return log_returns(align(history, bar_size), fill_limit, min_coverage, dense)
+
+
+def ewm_weights(count: int, halflife: float) -> np.ndarray:
+    weights = 0.5 ** (np.arange(count)[::-1] / halflife)
+    return weights / weights.sum()
+
+
+def standardize(returns: pd.DataFrame,
+                method: str = PEARSON,
+                halflife: Optional[float] = None,
+                dtype: type = np.float64) -> Tuple[np.ndarray, List[str]]:
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"Unknown correlation method: {method}")
+    values = (returns.rank() if method == SPEARMAN else returns).to_numpy(dtype=np.float64)
+    count = len(values)
+    weights = ewm_weights(count, halflife or DEFAULT_HALFLIFE) if method == EWM else np.full(count, 1. / max(count, 1))
+    centred = values - weights @ values
+    std = np.sqrt(weights @ centred ** 2)
+    usable = std > 0.
+    scaled = centred[:, usable] * np.sqrt(weights)[:, None] / std[usable]
+    return scaled.astype(dtype), [symbol for symbol, keep in zip(returns.columns, usable) if keep]
+
+
+def correlate(returns: pd.DataFrame, method: str = PEARSON, halflife: Optional[float] = None) -> pd.DataFrame:
+    scaled, symbols = standardize(returns, method, halflife)
+    return pd.DataFrame(np.clip(scaled.T @ scaled, -1., 1.), index=symbols, columns=symbols)
@@ -0,0 +1,59 @@
+import time
+import threading
+
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_REFRESH_SECONDS = 300.
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class SnapshotScheduler:
+    def __init__(self,
+                 compute: Callable[[str], Dict[str, Any]],
+                 keys: List[str],
+                 refresh_seconds: float = DEFAULT_REFRESH_SECONDS) -> None:
+        self.compute = compute
+        self.keys = list(keys)
+        self.refresh_seconds = refresh_seconds
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self, key: str) -> None:
+        started = time.perf_counter()
+        try:
+            snapshot = self.compute(key)
+        except Exception as error:
+            print(f"Failed to refresh {key}: {error}")
+            return
+        snapshot["refreshed_at"] = time.strftime(TIME_FORMAT)
+        snapshot["compute_seconds"] = time.perf_counter() - started
+        with self._lock:
+            self._snapshots[key] = snapshot
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.clear()
+            for key in self.keys:
+                if self._stopped:
+                    return
+                self.refresh(key)
+            self._wake.wait(self.refresh_seconds)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="snapshot-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._wake.set()
+
+    def request_refresh(self) -> None:
+        self._wake.set()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._snapshots.get(key)
@@ -1,7 +1,15 @@
-import statistics
+import os
+import argparse
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
 import pandas as pd
+import matplotlib.pyplot as plt
 
 from yahooquery import Ticker
+from history import StoredHistoryProvider, YahooQueryProvider
+from typing import Iterator, List, Optional, Tuple
 
 
 def get_history(symbol: str, interval: str, period: str) -> pd.DataFrame:
@@ -9,28 +17,155 @@ def get_history(symbol: str, interval: str, period: str) -> pd.DataFrame:
     row = ticker.history(interval=interval, period=period)
     return row
 
-def compute_returns(history: pd.DataFrame) -> list:
-    returns = []
-    adj_close = history['adjclose']
-    oldest_close = adj_close.pop(0)
-    for _, curr_close in adj_close.items():
-        returns.append((curr_close - oldest_close)/oldest_close)
-    return returns
+def pivot_closes(history: pd.DataFrame, column: str) -> pd.DataFrame:
+    field = "adjclose" if "adjclose" in history and history["adjclose"].notna().any() else "close"
+    return history.pivot_table(index="date", columns=column, values=field, aggfunc="last")
+
+def get_closes(symbols: List[str], interval: str, period: str) -> pd.DataFrame:
+    history = Ticker(symbols, adj_ohlc=True, asynchronous=True).history(interval=interval, period=period)
+    if not isinstance(history, pd.DataFrame):
+        history = pd.concat({symbol: frame for symbol, frame in history.items() if isinstance(frame, pd.DataFrame)},
+                            names=["symbol"])
+    return pivot_closes(history.reset_index(), "symbol")
 
-def compute_stats(ticker: str, returns: list) -> dict:
-    if returns:
+def compute_returns(closes: pd.DataFrame) -> pd.DataFrame:
+    return closes.sort_index().pct_change().iloc[1:]
+
+def compute_stats(ticker: str, returns: pd.Series) -> dict:
+    values = returns.dropna().to_numpy(dtype=np.float64)
+    if len(values) > 1:
         return {ticker: {
-            'mean': statistics.mean(returns),
-            'median': statistics.median(returns),
-            'stdev': statistics.stdev(returns),
-            'var': statistics.variance(returns)
+            'mean': float(values.mean()),
+            'median': float(np.median(values)),
+            'stdev': float(values.std(ddof=1)),
+            'var': float(values.var(ddof=1))
         }}
     return None
 
 def compute_returns_stats(ticker: str, interval: str, period: str) -> dict:
     ticks = get_history(ticker, interval, period).reset_index()
-    df = ticks[['date', 'adjclose']]
-    return compute_stats(ticker, compute_returns(df.to_dict()))
+    closes = ticks.set_index('date')['adjclose']
+    return compute_stats(ticker, compute_returns(closes))
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    cumulative = np.cumsum(values, axis=0)
+    summed = cumulative[window - 1:].copy()
+    summed[1:] -= cumulative[:-window]
+    return summed
+
+def _moments(returns: pd.DataFrame, window: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if window < 2 or window > len(returns):
+        raise ValueError(f"window must lie between 2 and {len(returns)}, got {window}")
+    values = returns.to_numpy(dtype=np.float64)
+    if np.isnan(values).any():
+        raise ValueError("returns must be dense; align and fill them first")
+    centred = values - values.mean(axis=0)
+    mean = _rolling_sum(centred, window) / window
+    square = _rolling_sum(centred ** 2, window) / window
+    return centred, mean, np.clip(square - mean ** 2, 0., None)
+
+def _correlation_rows(returns: pd.DataFrame, window: int) -> Iterator[np.ndarray]:
+    centred, mean, variance = _moments(returns, window)
+    scale = np.sqrt(variance)
+    for i in range(centred.shape[1]):
+        cross = _rolling_sum(centred[:, i:i + 1] * centred, window) / window
+        covariance = cross - mean[:, i:i + 1] * mean
+        with np.errstate(divide="ignore", invalid="ignore"):
+            yield np.clip(covariance / (scale[:, i:i + 1] * scale), -1., 1.)
+
+def rolling_correlation(returns: pd.DataFrame, window: int) -> np.ndarray:
+    size = len(returns.columns)
+    correlation = np.empty((len(returns) - window + 1, size, size))
+    for i, row in enumerate(_correlation_rows(returns, window)):
+        correlation[:, i, :] = row
+    return correlation
+
+def rolling_pair_correlation(returns: pd.DataFrame, first: str, second: str, window: int) -> pd.Series:
+    correlation = rolling_correlation(returns[[first, second]], window)[:, 0, 1]
+    return pd.Series(correlation, index=returns.index[window - 1:], name=f"{first}/{second}")
+
+def basket_correlation(returns: pd.DataFrame, window: int) -> pd.Series:
+    size = len(returns.columns)
+    total = np.zeros(len(returns) - window + 1)
+    for i, row in enumerate(_correlation_rows(returns, window)):
+        total += np.nansum(np.delete(row, i, axis=1), axis=1)
+    return pd.Series(total / (size * (size - 1)), index=returns.index[window - 1:], name="basket")
+
+def rolling_beta(returns: pd.DataFrame, benchmark: str, window: int) -> pd.DataFrame:
+    centred, mean, variance = _moments(returns, window)
+    market = list(returns.columns).index(benchmark)
+    cross = _rolling_sum(centred * centred[:, market:market + 1], window) / window
+    covariance = cross - mean * mean[:, market:market + 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = covariance / variance[:, market:market + 1]
+    return pd.DataFrame(beta, index=returns.index[window - 1:], columns=returns.columns)
+
+def rolling_vol(returns: pd.DataFrame, window: int, periods_per_year: Optional[float] = None) -> pd.DataFrame:
+    _, _, variance = _moments(returns, window)
+    vol = np.sqrt(variance * window / (window - 1))
+    if periods_per_year is not None:
+        vol *= np.sqrt(periods_per_year)
+    return pd.DataFrame(vol, index=returns.index[window - 1:], columns=returns.columns)
+
+def correlation_frame(returns: pd.DataFrame, window: int) -> pd.DataFrame:
+    columns = returns.columns
+    pairs = {f"{columns[i]}/{columns[j]}": row[:, j]
+             for i, row in enumerate(_correlation_rows(returns, window)) for j in range(i + 1, len(columns))}
+    return pd.DataFrame(pairs, index=returns.index[window - 1:], columns=list(pairs))
+
+def export_parquet(frame: pd.DataFrame, path: str) -> None:
+    frame.rename_axis("date").reset_index().to_parquet(path, index=False)
+
+def export_heatmap(frame: pd.DataFrame, path: str, title: str = "Rolling correlation") -> None:
+    figure, axis = plt.subplots(figsize=(12, max(3., 0.25 * len(frame.columns))))
+    image = axis.imshow(frame.to_numpy().T, aspect="auto", cmap="RdBu_r", vmin=-1., vmax=1., interpolation="nearest")
+    axis.set_yticks(np.arange(len(frame.columns)))
+    axis.set_yticklabels(frame.columns)
+    ticks = np.linspace(0, len(frame.index) - 1, min(8, len(frame.index))).astype(int)
+    axis.set_xticks(ticks)
+    axis.set_xticklabels([str(frame.index[tick])[:16] for tick in ticks], rotation=30, ha="right")
+    axis.set_title(title)
+    figure.colorbar(image, ax=axis)
+    figure.tight_layout()
+    figure.savefig(path, format="png", dpi=100, pil_kwargs={"optimize": True})
+    plt.close(figure)
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="rolling correlation analytics")
+    parser.add_argument("-symbols", type=str, nargs="+", required=True,
+                        help="Tickers to analyse")
+    parser.add_argument("-interval", type=str, default="1d",
+                        help="Bar size")
+    parser.add_argument("-period", type=str, default="1y",
+                        help="Lookback period")
+    parser.add_argument("-window", type=int, default=20,
+                        help="Rolling window in bars")
+    parser.add_argument("-output", type=str, default="analytics",
+                        help="Output directory")
+    parser.add_argument("-store", type=str, default=None,
+                        help="Bar store directory")
+    return parser.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    symbols = [symbol.upper() for symbol in args.symbols]
+    if args.store is not None:
+        history = StoredHistoryProvider(YahooQueryProvider(), args.store).fetch(symbols, args.interval, args.period)
+        closes = pivot_closes(history, "Symbol")
+    else:
+        closes = get_closes(symbols, args.interval, args.period)
+    returns = compute_returns(closes)
+    returns = returns.dropna()
+    os.makedirs(args.output, exist_ok=True)
+    correlations = correlation_frame(returns, args.window)
+    correlations["basket"] = basket_correlation(returns, args.window)
+    export_parquet(correlations, os.path.join(args.output, "rolling_correlation.parquet"))
+    export_parquet(rolling_vol(returns, args.window), os.path.join(args.output, "rolling_vol.parquet"))
+    export_parquet(rolling_beta(returns, returns.columns[0], args.window),
+                   os.path.join(args.output, "rolling_beta.parquet"))
+    export_heatmap(correlations, os.path.join(args.output, "rolling_correlation.png"))
+    for symbol in returns.columns:
+        print(compute_stats(symbol, returns[symbol]))
 
 if __name__ == "__main__":
-    print(compute_returns_stats('aapl', '1d', '7d'))
\ No newline at end of file
+    main()
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlation import StreamingCorrelation
+
+SYMBOLS = ["AAPL", "AMZN", "MSFT", "TSLA"]
+
+
+@pytest.fixture
+def returns():
+    generator = np.random.default_rng(7)
+    dates = pd.date_range("2020-07-01", periods=60, freq="h", tz="UTC")
+    values = generator.normal(size=(len(dates), len(SYMBOLS))) @ generator.normal(size=(len(SYMBOLS),) * 2)
+    frame = pd.DataFrame(values, index=dates, columns=SYMBOLS)
+    frame.iloc[5:9, 3] = np.nan
+    return frame
+
+
+def assert_matches(engine, frame):
+    expected = frame[sorted(frame.columns)].corr()
+    result = engine.correlation()
+    assert list(result.index) == list(expected.index) and list(result.columns) == list(expected.columns)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-12)
+
+
+def test_appended_bars_match_full_recompute(returns):
+    engine = StreamingCorrelation()
+    engine.update(returns.iloc[:30])
+    for stop in range(31, len(returns) + 1):
+        engine.update(returns.iloc[:stop])
+    assert_matches(engine, returns)
+
+
+def test_sliding_union_evicts_old_rows(returns):
+    engine = StreamingCorrelation()
+    for start in range(0, 30, 3):
+        engine.update(returns.iloc[start:start + 30])
+    assert_matches(engine, returns.iloc[27:57])
+
+
+def test_fixed_window(returns):
+    engine = StreamingCorrelation(window=20)
+    engine.update(returns.iloc[:40])
+    engine.update(returns)
+    assert_matches(engine, returns.iloc[-20:])
+
+
+def test_add_and_remove_symbol(returns):
+    engine = StreamingCorrelation()
+    engine.update(returns[SYMBOLS[:2]])
+    engine.update(returns[SYMBOLS[:3]])
+    assert_matches(engine, returns[SYMBOLS[:3]])
+    engine.update(returns[SYMBOLS[1:]])
+    assert_matches(engine, returns[SYMBOLS[1:]])
+
+
+def test_last_bar_revision(returns):
+    engine = StreamingCorrelation()
+    engine.update(returns)
+    revised = returns.copy()
+    revised.iloc[-1] += 0.5
+    engine.update(revised)
+    assert_matches(engine, revised)
+
+
+def test_historical_row_revision_rebuilds(returns):
+    engine = StreamingCorrelation()
+    engine.update(returns)
+    revised = returns.copy()
+    revised.iloc[10] += 0.5
+    engine.update(revised)
+    assert_matches(engine, revised)
+
+
+def test_union_row_set_change_rebuilds(returns):
+    engine = StreamingCorrelation()
+    engine.update(returns)
+    shrunk = returns.drop(returns.index[[12, 20]])
+    engine.update(shrunk)
+    assert_matches(engine, shrunk)
+    engine.update(returns)
+    assert_matches(engine, returns)
@@ -0,0 +1,82 @@
+import time
+import threading
+
+import pandas as pd
+
+from history import HistoryProvider, empty_history
+from history_cache import HistoryCache
+
+
+def bars(symbol, dates, close):
+    return pd.DataFrame({"date": pd.DatetimeIndex(dates), "close": close, "Symbol": symbol})
+
+
+class StubProvider(HistoryProvider):
+    def __init__(self, history, gate=None):
+        super().__init__()
+        self.history = history
+        self.gate = gate
+        self.calls = []
+
+    def fetch(self, symbols, interval, period):
+        self.calls.append((tuple(symbols), period))
+        if self.gate is not None:
+            self.gate.wait(5.)
+        frames = [self.history[period][symbol] for symbol in symbols if symbol in self.history[period]]
+        return pd.concat(frames, ignore_index=True) if frames else empty_history()
+
+
+def test_concurrent_misses_share_one_fetch():
+    now = pd.Timestamp.now().floor("h")
+    gate = threading.Event()
+    provider = StubProvider({"5d": {"AAPL": bars("AAPL", [now - pd.Timedelta(hours=1), now], [1., 2.])}}, gate)
+    cache = HistoryCache(provider, ttl=60.)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get(["AAPL"], "1h", "5d"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while cache.stats()["misses"] + cache.stats()["coalesced"] < 4:
+        time.sleep(0.01)
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert provider.calls == [(("AAPL",), "5d")]
+    assert cache.stats()["coalesced"] == 3
+    assert all(result["close"].tolist() == [1., 2.] for result in results)
+
+
+def test_fresh_entries_are_hits():
+    now = pd.Timestamp.now().floor("h")
+    provider = StubProvider({"5d": {"AAPL": bars("AAPL", [now], [1.])}})
+    cache = HistoryCache(provider, ttl=60.)
+    cache.get(["AAPL"], "1h", "5d")
+    cache.get(["AAPL"], "1h", "5d")
+    assert len(provider.calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_expired_entry_fetches_gap_and_trims_by_period():
+    now = pd.Timestamp.now(tz="UTC").tz_localize(None).floor("h")
+    old = [now - pd.Timedelta(days=6), now - pd.Timedelta(days=2), now - pd.Timedelta(hours=1)]
+    revised = [now - pd.Timedelta(hours=1), now]
+    provider = StubProvider({"5d": {"AAPL": bars("AAPL", old, [1., 2., 3.])},
+                             "1d": {"AAPL": bars("AAPL", revised, [3.5, 4.])}})
+    cache = HistoryCache(provider, ttl=0.)
+    cache.get(["AAPL"], "1h", "5d")
+    refreshed = cache.get(["AAPL"], "1h", "5d")
+
+    assert provider.calls == [(("AAPL",), "5d"), (("AAPL",), "1d")]
+    assert cache.stats()["refreshes"] == 1
+    assert refreshed["date"].tolist() == [old[1]] + revised
+    assert refreshed["close"].tolist() == [2., 3.5, 4.]
+
+
+def test_trim_is_anchored_on_the_latest_bar():
+    last = pd.Timestamp("2020-07-10 15:00")
+    old = [last - pd.Timedelta(days=6), last - pd.Timedelta(days=1)]
+    provider = StubProvider({"5d": {"AAPL": bars("AAPL", old, [1., 2.])},
+                             "1d": {"AAPL": bars("AAPL", [last], [3.])}})
+    cache = HistoryCache(provider, ttl=0.)
+    cache.get(["AAPL"], "1h", "5d")
+    assert cache.get(["AAPL"], "1h", "5d")["date"].tolist() == [old[1], last]
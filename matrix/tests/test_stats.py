@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+stats = pytest.importorskip("stats")
+
+DATES = pd.date_range("2020-07-01", periods=4, freq="D", name="date")
+
+
+def history(close):
+    return pd.DataFrame({"close": close, "adjclose": np.multiply(close, 0.5)}, index=DATES)
+
+
+class StubTicker:
+    def __init__(self, symbols, **kwargs):
+        self.symbols = symbols
+
+    def history(self, interval, period):
+        return {"AAPL": history([1., 2., 3., 4.]), "MSFT": history([2., 2., 4., 4.]),
+                "XYZ": "No data found, symbol may be delisted"}
+
+
+def test_get_closes_skips_failed_symbols(monkeypatch):
+    monkeypatch.setattr(stats, "Ticker", StubTicker)
+    closes = stats.get_closes(["AAPL", "MSFT", "XYZ"], "1d", "5d")
+    assert list(closes.columns) == ["AAPL", "MSFT"]
+    assert closes["AAPL"].tolist() == [.5, 1., 1.5, 2.]
+
+
+def test_rolling_correlation_matches_pandas():
+    generator = np.random.default_rng(3)
+    returns = pd.DataFrame(generator.normal(size=(50, 3)), columns=["A", "B", "C"])
+    frame = stats.correlation_frame(returns, 10)
+    expected = returns["A"].rolling(10).corr(returns["C"]).iloc[9:]
+    np.testing.assert_allclose(frame["A/C"].to_numpy(), expected.to_numpy(), rtol=1e-9)
+    basket = stats.basket_correlation(returns, 10)
+    np.testing.assert_allclose(basket.to_numpy(), frame.mean(axis=1).to_numpy(), rtol=1e-9)
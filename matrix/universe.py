@@ -0,0 +1,73 @@
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+from preprocess import standardize, PEARSON
+from typing import Dict, List, Optional, Tuple
+
+DENSE = "dense"
+UNIVERSE = "universe"
+DEFAULT_TOP_K = 5
+DEFAULT_BLOCK_SIZE = 256
+NEIGHBOUR_COLUMNS = ["Tickers", "Most Correlated", "Least Correlated"]
+
+
+def _top_k(block: np.ndarray, k: int, largest: bool) -> Tuple[np.ndarray, np.ndarray]:
+    keyed = -block if largest else block
+    keyed = np.where(np.isnan(keyed), np.inf, keyed)
+    k = min(k, block.shape[1])
+    index = np.argpartition(keyed, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(keyed, index, axis=1), axis=1, kind="mergesort")
+    index = np.take_along_axis(index, order, axis=1)
+    return index, np.take_along_axis(block, index, axis=1)
+
+
+def blocked_correlation(scaled: np.ndarray,
+                        path: str,
+                        top_k: int = DEFAULT_TOP_K,
+                        block_size: int = DEFAULT_BLOCK_SIZE) -> Dict[str, np.ndarray]:
+    size = scaled.shape[1]
+    matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(size, size))
+    k = min(top_k, max(size - 1, 0))
+    neighbours = {
+        "most_index": np.zeros((size, k), dtype=np.int64),
+        "most_value": np.zeros((size, k), dtype=np.float32),
+        "least_index": np.zeros((size, k), dtype=np.int64),
+        "least_value": np.zeros((size, k), dtype=np.float32)
+    }
+    for start in range(0, size, block_size):
+        stop = min(start + block_size, size)
+        block = np.clip(scaled[:, start:stop].T @ scaled, -1., 1.)
+        matrix[start:stop] = block
+        if k:
+            rows = np.arange(stop - start)
+            block[rows, rows + start] = np.nan
+            neighbours["most_index"][start:stop], neighbours["most_value"][start:stop] = _top_k(block, k, True)
+            neighbours["least_index"][start:stop], neighbours["least_value"][start:stop] = _top_k(block, k, False)
+    matrix.flush()
+    return neighbours
+
+
+def neighbour_rows(returns: pd.DataFrame,
+                   output_dir: str,
+                   name: str,
+                   top_k: int = DEFAULT_TOP_K,
+                   block_size: int = DEFAULT_BLOCK_SIZE,
+                   method: str = PEARSON,
+                   halflife: Optional[float] = None) -> List[Dict[str, str]]:
+    scaled, symbols = standardize(returns, method, halflife, np.float32)
+    os.makedirs(output_dir, exist_ok=True)
+    neighbours = blocked_correlation(scaled, os.path.join(output_dir, f"{name}.npy"), top_k, block_size)
+    with open(os.path.join(output_dir, f"{name}_symbols.json"), "w") as symbols_file:
+        json.dump(symbols, symbols_file)
+
+    def describe(indices: np.ndarray, values: np.ndarray) -> str:
+        return ", ".join(f"{symbols[index]} ({value:.2f})" for index, value in zip(indices, values))
+
+    return [{
+        "Tickers": symbol,
+        "Most Correlated": describe(neighbours["most_index"][row], neighbours["most_value"][row]),
+        "Least Correlated": describe(neighbours["least_index"][row], neighbours["least_value"][row])
+    } for row, symbol in enumerate(symbols)]
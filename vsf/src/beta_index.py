@@ -0,0 +1,102 @@
+import os
+import asyncio
+import logging
+import threading
+import numpy as np
+import pandas as pd
+import yahoo_fin.stock_info
+
+from datetime import datetime, timedelta
+from fetch_engine import FetchEngine, QUOTE_HOST, run_sync
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+BETA_FIELD = "Beta (5Y Monthly)"
+BETA_COLUMNS = ["ticker", "beta", "as_of"]
+DEFAULT_BETA_INDEX_PATH = "beta_index.csv"
+DEFAULT_BETA_MAX_AGE_DAYS = 7
+
+
+class BetaIndex:
+    def __init__(self,
+                 log: logging.Logger,
+                 fetcher: FetchEngine,
+                 path: str = DEFAULT_BETA_INDEX_PATH,
+                 max_age_days: float = DEFAULT_BETA_MAX_AGE_DAYS) -> None:
+        self.log = log
+        self.fetcher = fetcher
+        self.path = path
+        self.max_age = timedelta(days=max_age_days)
+        self._lock = threading.Lock()
+        self._refreshing: Optional[threading.Thread] = None
+        self.table = self._load()
+
+    def _load(self) -> pd.DataFrame:
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=BETA_COLUMNS[1:], index=pd.Index([], name="ticker"))
+        return pd.read_csv(self.path, index_col="ticker", parse_dates=["as_of"])
+
+    def _save(self) -> None:
+        self.table.to_csv(self.path + ".tmp")
+        os.replace(self.path + ".tmp", self.path)
+
+    def missing(self, tickers: List[str]) -> List[str]:
+        with self._lock:
+            return list(pd.Index(tickers).difference(self.table.index))
+
+    def expired(self, tickers: List[str]) -> List[str]:
+        with self._lock:
+            as_of = self.table["as_of"].reindex(tickers)
+        return list(as_of.index[as_of < datetime.now() - self.max_age])
+
+    async def _fetch_beta(self, ticker: str) -> Tuple[str, Optional[float]]:
+        try:
+            quote = await self.fetcher.call(QUOTE_HOST, yahoo_fin.stock_info.get_quote_table, ticker)
+        except Exception as error:
+            self.log.error(str(error) + ticker)
+            return ticker, None
+        try:
+            return ticker, float(quote[BETA_FIELD])
+        except (KeyError, TypeError, ValueError):
+            return ticker, np.nan
+
+    def _update(self, betas: Dict[str, float]) -> None:
+        if not betas:
+            return
+        fetched = pd.DataFrame({"beta": list(betas.values()), "as_of": datetime.now()},
+                               index=pd.Index(list(betas), name="ticker"))
+        with self._lock:
+            self.table = pd.concat([self.table.drop(fetched.index, errors="ignore"), fetched])
+            self._save()
+
+    async def stream(self, tickers: List[str]) -> AsyncIterator[Tuple[str, float]]:
+        tasks = [asyncio.ensure_future(self._fetch_beta(ticker)) for ticker in dict.fromkeys(tickers)]
+        betas: Dict[str, float] = {}
+        try:
+            for task in asyncio.as_completed(tasks):
+                ticker, beta = await task
+                if beta is not None:
+                    betas[ticker] = beta
+                    yield ticker, beta
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._update(betas)
+
+    async def _refresh(self, tickers: List[str]) -> None:
+        async for _ in self.stream(tickers):
+            pass
+
+    def refresh(self, tickers: List[str]) -> None:
+        run_sync(self._refresh(tickers))
+
+    def refresh_in_background(self, tickers: List[str]) -> None:
+        if self._refreshing is not None and self._refreshing.is_alive():
+            return
+        self._refreshing = threading.Thread(target=self.refresh, args=(tickers,), daemon=True)
+        self._refreshing.start()
+
+    def screen(self, tickers: List[str], beta_threshold: float) -> List[str]:
+        with self._lock:
+            betas = self.table["beta"].reindex(tickers).to_numpy(dtype=float)
+        return np.asarray(tickers, dtype=object)[betas >= beta_threshold].tolist()
@@ -1,6 +1,7 @@
 import csv
 import asyncio
 import datetime
+import pandas as pd
 
 from yahoo_stocks import YahooStocks
 from yahoo_options import YahooOptions
@@ -10,7 +11,7 @@ from typing import Union, List, Any, Dict
 
 class CsvExporter:
     def __init__(self,
-                 data: Dict[str, Any],
+                 data: pd.DataFrame,
                  yahoo_adapter,
                  expiration_date: datetime.datetime = None):
         self.data = data
@@ -19,10 +20,7 @@ class CsvExporter:
 
     def export_stats_to_csv(self) -> Dict[str, bool]:
         if isinstance(self.yahoo_adapter, YahooStocks):
-            with open("adjclose_stats.csv", "w", newline="") as csv_file:
-                writer = csv.writer(csv_file)
-                for key, value in self.data.items():
-                    writer.writerow([key, value])
+            self.data.to_csv("adjclose_stats.csv")
             return {"success": True}
         return {"success": False}
 
@@ -30,7 +28,7 @@ class CsvExporter:
         if isinstance(self.yahoo_adapter, YahooStocks):
             asyncio.set_event_loop(asyncio.new_event_loop())
             ticker_stats = asyncio.get_event_loop().run_until_complete(
-                self.yahoo_adapter.get_ticker_stats(list(self.data.keys())))
+                self.yahoo_adapter.get_ticker_stats(list(self.data.index)))
             with open("ticker_stats.csv", "w", newline="") as csv_file:
                 writer = csv.writer(csv_file)
                 for key, value in ticker_stats.items():
@@ -40,7 +38,7 @@ class CsvExporter:
 
     def export_options_chain_to_csv(self) -> Dict[str, bool]:
         if isinstance(self.yahoo_adapter, YahooOptions):
-            options_chain = self.yahoo_adapter.get_options_chain(list(self.data.keys()),
+            options_chain = self.yahoo_adapter.get_options_chain(list(self.data.index),
                                                                  self.expiration_date)
             with open("option_chain.csv", "w", newline="") as csv_file:
                 writer = csv.writer(csv_file)
@@ -0,0 +1,138 @@
+import time
+import random
+import asyncio
+import logging
+import threading
+import requests
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict
+
+CHART_HOST = "query1.finance.yahoo.com"
+QUOTE_HOST = "finance.yahoo.com"
+WIKIPEDIA_HOST = "en.wikipedia.org"
+NASDAQ_FTP_HOST = "ftp.nasdaqtrader.com"
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_REQUESTS_PER_SECOND = 8.
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_TIMEOUT = 30.
+DEFAULT_MAX_IN_FLIGHT = 4
+SLOT_POLL_SECONDS = 0.05
+
+
+def run_sync(coroutine: Awaitable[Any]) -> Any:
+    outcome: Dict[str, Any] = {}
+
+    def run() -> None:
+        loop = asyncio.new_event_loop()
+        try:
+            outcome["result"] = loop.run_until_complete(coroutine)
+        except Exception as error:
+            outcome["error"] = error
+        finally:
+            loop.close()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def retryable(error: BaseException) -> bool:
+    if isinstance(error, (asyncio.TimeoutError, requests.Timeout, requests.ConnectionError, ConnectionError)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return False
+
+
+class RateLimiter:
+    def __init__(self, requests_per_second: float) -> None:
+        self.interval = 1. / requests_per_second if requests_per_second > 0 else 0.
+        self._next = 0.
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self._next - now, 0.)
+            self._next = max(self._next, now) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class FetchEngine:
+    def __init__(self,
+                 log: logging.Logger,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                 retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> None:
+        self.log = log
+        self.requests_per_second = requests_per_second
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, host: str) -> RateLimiter:
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = RateLimiter(self.requests_per_second)
+            return self._limiters[host]
+
+    def slots(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.max_in_flight)
+            return self._slots[host]
+
+    @staticmethod
+    def _run(slots: threading.BoundedSemaphore, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        try:
+            return func(*args, **kwargs)
+        finally:
+            slots.release()
+
+    async def _submit(self, host: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        slots = self.slots(host)
+        while not slots.acquire(blocking=False):
+            await asyncio.sleep(SLOT_POLL_SECONDS)
+        try:
+            future = self.executor.submit(self._run, slots, func, *args, **kwargs)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda done: slots.release() if done.cancelled() else None)
+        return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+
+    async def call(self, host: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        for attempt in range(self.retries + 1):
+            await self.limiter(host).acquire()
+            try:
+                return await self._submit(host, func, *args, **kwargs)
+            except Exception as error:
+                if attempt == self.retries or not retryable(error):
+                    raise
+                delay = self.backoff * 2 ** attempt * (1. + random.random())
+                self.log.warning(f"{func.__name__}{args} failed ({error!r}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    @classmethod
+    def from_config(cls, log: logging.Logger, config: Dict[str, Any]) -> "FetchEngine":
+        return cls(log,
+                   config.get("fetch_workers", DEFAULT_MAX_WORKERS),
+                   config.get("requests_per_second", DEFAULT_REQUESTS_PER_SECOND),
+                   config.get("fetch_retries", DEFAULT_RETRIES),
+                   config.get("fetch_backoff", DEFAULT_BACKOFF),
+                   config.get("fetch_timeout", DEFAULT_TIMEOUT),
+                   config.get("fetch_max_in_flight", DEFAULT_MAX_IN_FLIGHT))
@@ -1,5 +1,4 @@
 import json
-import asyncio
 import argparse
 import datetime
 
@@ -8,13 +7,16 @@ from PyQt5 import QtWidgets
 from logger import Logger
 from functools import partial
 
-from thread_worker import Worker
-from yahoo_stocks import YahooStocks
+from thread_worker import Worker, StreamWorker
+from yahoo_stocks import YahooStocks, SearchUpdate
+from search_results import SearchResultsModel
 from yahoo_options import YahooOptions
 from csv_exporter import CsvExporter
 from stocks_feed import TopStocksFeed
 
-from typing import Dict, Any, List
+import pandas as pd
+
+from typing import Dict, Any, List, AsyncIterator, Optional, Set
 
 
 class MainWindow(QtWidgets.QMainWindow):
@@ -23,7 +25,9 @@ class MainWindow(QtWidgets.QMainWindow):
         super(MainWindow, self).__init__(*args, **kwargs)
         self.logger = Logger("ui.log").get_logger()
         self.exchanges_to_search: List[str] = []
-        self.search_results: Dict[str, Dict[str, float]] = {}
+        self.search_results = pd.DataFrame()
+        self.search_worker: Optional[StreamWorker] = None
+        self.cancelled_workers: Set[StreamWorker] = set()
         self.thread_pool = QtCore.QThreadPool()
         self.stats_to_compute = config["stats"]
         self.available_exchanges = config["exchanges"]
@@ -145,35 +149,74 @@ class MainWindow(QtWidgets.QMainWindow):
             self.beta_threshold = float(self.params_window.beta_threshold.text())
             self.lookback_period = int(self.params_window.lookback_period.text())
             self.params_window.close()
-            self._dispatch(self.find_stocks, self.display_search_results)
+            self.start_search()
+
+    def start_search(self) -> None:
+        if self.search_worker is not None:
+            self.cancel_search()
+            self.cancelled_workers.add(self.search_worker)
+            self.search_worker = None
+            self.search_frame.close()
+
+        self.search_layout = QtWidgets.QVBoxLayout()
+        self.search_frame = QtWidgets.QWidget()
+        self.search_frame.setLayout(self.search_layout)
+
+        self.results_model = SearchResultsModel(self.stats_to_compute)
+        results_view = QtWidgets.QTableView()
+        results_view.setModel(self.results_model)
+        self.search_layout.addWidget(results_view)
+
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setMaximum(0)
+        self.search_layout.addWidget(self.progress_bar)
+
+        self.cancel_button = QtWidgets.QPushButton("Cancel search")
+        self.cancel_button.clicked.connect(self.cancel_search)
+        self.search_layout.addWidget(self.cancel_button)
+
+        self.layout.addWidget(self.search_frame)
+        self.search_frame.show()
+
+        worker = StreamWorker(self.search_stream)
+        worker.signals.result.connect(partial(self.on_search_update, worker))
+        worker.signals.finished.connect(partial(self.on_search_finished, worker))
+        self.search_worker = worker
+        self.thread_pool.start(worker)
 
-    def display_search_results(self) -> None:
+    def search_stream(self) -> AsyncIterator[SearchUpdate]:
+        end_date = datetime.datetime.now()
+        start_date = end_date - datetime.timedelta(days=self.lookback_period)
+        return self.yahoo_stocks.stream_search(list(self.exchanges_to_search),
+                                               self.beta_threshold,
+                                               start_date,
+                                               end_date,
+                                               self.stats_to_compute)
+
+    def cancel_search(self) -> None:
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+
+    def on_search_update(self, worker: StreamWorker, update: SearchUpdate) -> None:
+        if worker is not self.search_worker:
+            return
+        self.progress_bar.setMaximum(update.total)
+        self.progress_bar.setValue(update.completed)
+        if update.stats is not None:
+            self.results_model.append(update.stats)
+
+    def on_search_finished(self, worker: StreamWorker) -> None:
+        self.cancelled_workers.discard(worker)
+        if worker is not self.search_worker:
+            return
+        self.search_worker = None
+        self.progress_bar.hide()
+        self.cancel_button.hide()
+        self.search_results = self.results_model.frame()
         if len(self.search_results) > 0:
-            search_layout = QtWidgets.QVBoxLayout()
-            search_frame = QtWidgets.QWidget()
-            search_frame.setLayout(search_layout)
-
-            w = QtWidgets.QTableWidget(0, len(self.search_results.keys())+1)
-            w.setHorizontalHeaderLabels(["Statistic"] + list(self.search_results.keys()))
-
-            for i, k in enumerate(self.stats_to_compute):
-                w.insertRow(w.rowCount())
-                it = QtWidgets.QTableWidgetItem()
-                it.setData(QtCore.Qt.DisplayRole, str(k))
-                w.setItem(i, 0, it)
-
-            for i, (key, value) in enumerate(self.search_results.items()):
-                rows = [value[k] for k in value.keys()]
-                for j, v in enumerate(rows):
-                    it = QtWidgets.QTableWidgetItem()
-                    it.setData(QtCore.Qt.DisplayRole, str(v))
-                    w.setItem(j, i+1, it)
-
-            search_layout.addWidget(w)
-            self._add_buttons_to_results(search_layout, search_frame)
-            self.layout.addWidget(search_frame)
-            search_frame.show()
+            self._add_buttons_to_results(self.search_layout, self.search_frame)
         else:
+            self.search_frame.close()
             self._show_error_window("No stocks found")
 
     def _add_buttons_to_results(self, search_layout, search_frame) -> None:
@@ -201,7 +244,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def show_options_data(self) -> None:
         combo_box = QtWidgets.QComboBox()
-        combo_box.addItems(self.yahoo_options.get_expiration_dates(list(self.search_results.keys())))
+        combo_box.addItems(self.yahoo_options.get_expiration_dates(list(self.search_results.index)))
         self.options_popup_layout.addWidget(combo_box)
         expiration_date = datetime.datetime.strptime(str(combo_box.currentText()), "%B %d, %Y")
         yahoo_options_csv = CsvExporter(self.search_results, self.yahoo_options, expiration_date)
@@ -212,16 +255,6 @@ class MainWindow(QtWidgets.QMainWindow):
         self.options_popup_layout.addWidget(ops_button)
         self.options_popup_frame.show()
 
-    def find_stocks(self) -> Dict[str, Dict[str, float]]:
-        asyncio.set_event_loop(asyncio.new_event_loop())
-        end_date = datetime.datetime.now()
-        start_date = end_date - datetime.timedelta(days=self.lookback_period)
-        vol_tickers = self.yahoo_stocks.get_volatile_tickers(self.yahoo_stocks.get_tickers(self.exchanges_to_search),
-                                               self.beta_threshold)
-        ticker_data = asyncio.get_event_loop().run_until_complete(self.yahoo_stocks.get_ticker_data(vol_tickers, start_date, end_date))
-        self.search_results = self.yahoo_stocks.get_adjclose_stats(ticker_data)
-        return self.search_results
-
 
 def parse_args() -> str:
     parser = argparse.ArgumentParser(description="vsf")
@@ -0,0 +1,43 @@
+import pandas as pd
+
+from PyQt5 import QtCore
+from typing import Any, List
+
+
+class SearchResultsModel(QtCore.QAbstractTableModel):
+    def __init__(self, stats: List[str], parent: QtCore.QObject = None):
+        super(SearchResultsModel, self).__init__(parent)
+        self.stats = list(stats)
+        self.tickers: List[str] = []
+        self.rows: List[List[float]] = []
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.tickers)
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.stats) + 1
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> Any:
+        if not index.isValid() or role != QtCore.Qt.DisplayRole:
+            return None
+        if index.column() == 0:
+            return self.tickers[index.row()]
+        return str(self.rows[index.row()][index.column() - 1])
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation,
+                   role: int = QtCore.Qt.DisplayRole) -> Any:
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return (["Ticker"] + self.stats)[section]
+        return super(SearchResultsModel, self).headerData(section, orientation, role)
+
+    def append(self, stats: pd.DataFrame) -> None:
+        if stats.empty:
+            return
+        first = len(self.tickers)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(stats) - 1)
+        self.tickers += list(stats.index)
+        self.rows += stats[self.stats].to_numpy().tolist()
+        self.endInsertRows()
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.rows, index=pd.Index(self.tickers, name="ticker"), columns=self.stats)
@@ -0,0 +1,71 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+from typing import Callable, Dict, List, Tuple
+
+TRADING_DAYS = 252
+ATR_WINDOW = 14
+DEFAULT_STATS = ["mean", "median", "std_dev", "variance"]
+
+
+def panel(ticker_data: Dict[str, pd.DataFrame], field: str) -> pd.DataFrame:
+    return pd.concat({ticker: frame[field] for ticker, frame in ticker_data.items()}, axis=1).sort_index()
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    rows = np.where(np.isnan(values), 0, np.arange(len(values))[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return np.take_along_axis(values, rows, axis=0)
+
+
+def log_returns(prices: np.ndarray) -> np.ndarray:
+    return np.log(prices[1:]) - np.log(forward_fill(prices)[:-1])
+
+
+def realized_vol(prices: np.ndarray) -> np.ndarray:
+    return np.nanstd(log_returns(prices), axis=0, ddof=1) * np.sqrt(TRADING_DAYS)
+
+
+def max_drawdown(prices: np.ndarray) -> np.ndarray:
+    return np.nanmin(prices / np.fmax.accumulate(prices, axis=0) - 1., axis=0)
+
+
+def average_true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    previous = forward_fill(close)[:-1]
+    true_range = np.fmax(high[1:] - low[1:], np.fmax(np.abs(high[1:] - previous), np.abs(low[1:] - previous)))
+    valid = ~np.isnan(true_range)
+    recent = np.cumsum(valid[::-1], axis=0)[::-1] <= ATR_WINDOW
+    return np.nanmean(np.where(valid & recent, true_range, np.nan), axis=0)
+
+
+STATISTICS: Dict[str, Tuple[Tuple[str, ...], Callable[..., np.ndarray]]] = {
+    "mean": (("adjclose",), lambda prices: np.nanmean(prices, axis=0)),
+    "median": (("adjclose",), lambda prices: np.nanmedian(prices, axis=0)),
+    "std_dev": (("adjclose",), lambda prices: np.nanstd(prices, axis=0, ddof=1)),
+    "variance": (("adjclose",), lambda prices: np.nanvar(prices, axis=0, ddof=1)),
+    "realized_vol": (("adjclose",), realized_vol),
+    "max_drawdown": (("adjclose",), max_drawdown),
+    "atr": (("high", "low", "close"), average_true_range)
+}
+
+
+def compute_stats(ticker_data: Dict[str, pd.DataFrame], stats: List[str] = DEFAULT_STATS) -> pd.DataFrame:
+    unknown = [stat for stat in stats if stat not in STATISTICS]
+    if unknown:
+        raise ValueError(f"Unknown statistics: {', '.join(unknown)}")
+    index = pd.Index(list(ticker_data), name="ticker")
+    if not ticker_data:
+        return pd.DataFrame(columns=stats, index=index, dtype=float)
+
+    panels: Dict[str, np.ndarray] = {}
+    columns: Dict[str, np.ndarray] = {}
+    with warnings.catch_warnings(), np.errstate(all="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for stat in stats:
+            fields, statistic = STATISTICS[stat]
+            for field in fields:
+                if field not in panels:
+                    panels[field] = panel(ticker_data, field).to_numpy(dtype=np.float64)
+            columns[stat] = statistic(*[panels[field] for field in fields])
+    return pd.DataFrame(columns, index=index, columns=stats)
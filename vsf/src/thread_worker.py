@@ -1,9 +1,12 @@
+import asyncio
+import threading
+
 from PyQt5 import QtCore
-from typing import Callable, Any
+from typing import AsyncIterator, Callable, Any, Optional
 
 
 class WorkerSignals(QtCore.QObject):
-    result = QtCore.pyqtSignal(dict)
+    result = QtCore.pyqtSignal(object)
 
 
 class Worker(QtCore.QRunnable):
@@ -20,6 +23,57 @@ class Worker(QtCore.QRunnable):
         self.signals.result.emit(result)
 
 
+class StreamSignals(QtCore.QObject):
+    result = QtCore.pyqtSignal(object)
+    finished = QtCore.pyqtSignal()
+
+
+class StreamWorker(QtCore.QRunnable):
+    def __init__(self, stream: Callable[[], AsyncIterator[Any]]):
+        super(StreamWorker, self).__init__()
+        self.stream = stream
+        self.signals = StreamSignals()
+        self._cancelled = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Future] = None
+        self._lock = threading.Lock()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled.set()
+            if self._loop is not None and self._task is not None:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+
+    async def _consume(self) -> None:
+        stream = self.stream()
+        try:
+            async for item in stream:
+                if self._cancelled.is_set():
+                    break
+                self.signals.result.emit(item)
+        finally:
+            await stream.aclose()
+
+    @QtCore.pyqtSlot()
+    def run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            with self._lock:
+                if self._cancelled.is_set():
+                    return
+                self._loop = loop
+                self._task = asyncio.ensure_future(self._consume())
+            loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            with self._lock:
+                self._loop = None
+            loop.close()
+            self.signals.finished.emit()
+
+
 class UpdateThread(QtCore.QThread):
     updateData = QtCore.pyqtSignal(object)
 
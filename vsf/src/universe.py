@@ -0,0 +1,83 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+import yahoo_fin.stock_info
+
+from fetch_engine import FetchEngine, NASDAQ_FTP_HOST, WIKIPEDIA_HOST, run_sync
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_UNIVERSE_CACHE_DIR = "universe"
+DEFAULT_UNIVERSE_TTL_HOURS = 24
+
+EXCHANGE_LOADERS: Dict[str, Callable[[], List[str]]] = {
+    "dow": yahoo_fin.stock_info.tickers_dow,
+    "sp500": yahoo_fin.stock_info.tickers_sp500,
+    "nasdaq": yahoo_fin.stock_info.tickers_nasdaq,
+    "other": yahoo_fin.stock_info.tickers_other
+}
+EXCHANGE_HOSTS = {
+    "dow": WIKIPEDIA_HOST,
+    "sp500": WIKIPEDIA_HOST,
+    "nasdaq": NASDAQ_FTP_HOST,
+    "other": NASDAQ_FTP_HOST
+}
+
+
+class UniverseRegistry:
+    def __init__(self,
+                 log: logging.Logger,
+                 fetcher: FetchEngine,
+                 cache_dir: str = DEFAULT_UNIVERSE_CACHE_DIR,
+                 ttl_hours: float = DEFAULT_UNIVERSE_TTL_HOURS) -> None:
+        self.log = log
+        self.fetcher = fetcher
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_hours * 3600.
+        self._lock = threading.Lock()
+
+    def _path(self, exchange: str) -> str:
+        return os.path.join(self.cache_dir, f"{exchange}.json")
+
+    def _read(self, exchange: str, fresh: bool) -> Optional[List[str]]:
+        path = self._path(exchange)
+        if not os.path.exists(path):
+            return None
+        with open(path) as cache_file:
+            cached = json.load(cache_file)
+        if fresh and time.time() - cached["as_of"] > self.ttl_seconds:
+            return None
+        return cached["tickers"]
+
+    def _write(self, exchange: str, tickers: List[str]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(exchange)
+        with self._lock:
+            with open(path + ".tmp", "w") as cache_file:
+                json.dump({"as_of": time.time(), "tickers": tickers}, cache_file)
+            os.replace(path + ".tmp", path)
+
+    async def _load(self, exchange: str) -> List[str]:
+        if exchange not in EXCHANGE_LOADERS:
+            self.log.error("Unknown exchange " + exchange)
+            return []
+        cached = self._read(exchange, fresh=True)
+        if cached is not None:
+            return cached
+        try:
+            loaded = await self.fetcher.call(EXCHANGE_HOSTS[exchange], EXCHANGE_LOADERS[exchange])
+        except Exception as error:
+            self.log.error(str(error) + exchange)
+            return self._read(exchange, fresh=False) or []
+        tickers = [ticker for ticker in (str(ticker).strip().upper() for ticker in loaded) if ticker]
+        self._write(exchange, tickers)
+        return tickers
+
+    async def load(self, exchanges: List[str]) -> List[str]:
+        loaded = await asyncio.gather(*[self._load(exchange) for exchange in dict.fromkeys(exchanges)])
+        return list(dict.fromkeys(ticker for tickers in loaded for ticker in tickers))
+
+    def tickers(self, exchanges: List[str]) -> List[str]:
+        return run_sync(self.load(exchanges))
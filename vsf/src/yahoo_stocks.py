@@ -6,8 +6,20 @@ import pandas as pd
 import yahoo_fin.stock_info
 
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, AsyncIterator, NamedTuple, Set, Tuple
 from logger import Logger
+from bar_store import BarStore
+from fetch_engine import FetchEngine, CHART_HOST, QUOTE_HOST
+from beta_index import BetaIndex, DEFAULT_BETA_INDEX_PATH, DEFAULT_BETA_MAX_AGE_DAYS
+from stats_engine import compute_stats, DEFAULT_STATS
+from universe import UniverseRegistry, DEFAULT_UNIVERSE_CACHE_DIR, DEFAULT_UNIVERSE_TTL_HOURS
+
+
+class SearchUpdate(NamedTuple):
+    ticker: Optional[str]
+    stats: Optional[pd.DataFrame]
+    completed: int
+    total: int
 
 
 class YahooStocks:
@@ -16,46 +28,65 @@ class YahooStocks:
                  config: Dict[str, Any]) -> None:
         self.log = log
         self.config = config
+        self.fetcher = FetchEngine.from_config(log, config)
+        self.beta_index = BetaIndex(log,
+                                    self.fetcher,
+                                    config.get("beta_index_path", DEFAULT_BETA_INDEX_PATH),
+                                    config.get("beta_max_age_days", DEFAULT_BETA_MAX_AGE_DAYS))
+        self.universe = UniverseRegistry(log,
+                                         self.fetcher,
+                                         config.get("universe_cache_dir", DEFAULT_UNIVERSE_CACHE_DIR),
+                                         config.get("universe_ttl_hours", DEFAULT_UNIVERSE_TTL_HOURS))
+        self.store: Optional[BarStore] = None
+        if "bar_store_dir" in config:
+            self.store = BarStore(config["bar_store_dir"], "1d")
 
     def get_tickers(self,
                     exchanges: List[str]) -> List[str]:
-        tickers: List[str] = []
-        for exchange in exchanges:
-            try:
-                exchange_tickers = eval(
-                    "yahoo_fin.stock_info.tickers_" + exchange + "()")
-                tickers += exchange_tickers
-            except Exception as error:
-                self.log.error(str(error) + exchange)
-                continue
-        return tickers
+        return self.universe.tickers(exchanges)
 
     def get_volatile_tickers(self,
                              tickers: List[str],
                              beta_threshold: float) -> List[str]:
-        vol_tickers: List[str] = []
-        for ticker in tickers:
-            try:
-                data = yahoo_fin.stock_info.get_quote_table(ticker)
-            except Exception as error:
-                self.log.error(str(error) + ticker)
-                continue
-            else:
-                if float(data["Beta (5Y Monthly)"]) >= beta_threshold:
-                    vol_tickers.append(ticker)
-        return vol_tickers
+        missing = self.beta_index.missing(tickers)
+        if missing:
+            self.beta_index.refresh(missing)
+        expired = self.beta_index.expired(tickers)
+        if expired:
+            self.beta_index.refresh_in_background(expired)
+        return self.beta_index.screen(tickers, beta_threshold)
 
     async def _get_data(self, ticker: str,
                         ticker_data: Dict[str, pd.DataFrame],
                         start_date: datetime,
                         end_date: datetime) -> None:
-        try:
-            ticker_data[ticker] = yahoo_fin.stock_info.get_data(ticker,
-                                                                start_date=start_date.strftime(
-                                                                    "%m/%d/%Y"),
-                                                                end_date=end_date.strftime("%m/%d/%Y"))
-        except Exception as error:
-            self.log.error(str(error) + ticker)
+        if self.store is None:
+            try:
+                ticker_data[ticker] = await self.fetcher.call(CHART_HOST,
+                                                              yahoo_fin.stock_info.get_data,
+                                                              ticker,
+                                                              start_date=start_date.strftime("%m/%d/%Y"),
+                                                              end_date=end_date.strftime("%m/%d/%Y"))
+            except Exception as error:
+                self.log.error(str(error) + ticker)
+            return
+
+        covered_from = self.store.covered_from(ticker)
+        last = self.store.last(ticker)
+        full = covered_from is None or covered_from > start_date
+        fetch_start = start_date if full else max(last, start_date)
+        if fetch_start < end_date:
+            try:
+                data = await self.fetcher.call(CHART_HOST,
+                                               yahoo_fin.stock_info.get_data,
+                                               ticker,
+                                               start_date=fetch_start.strftime("%m/%d/%Y"),
+                                               end_date=end_date.strftime("%m/%d/%Y"))
+                self.store.ingest(ticker, data, covered_from=start_date if full else None)
+            except Exception as error:
+                self.log.error(str(error) + ticker)
+        if self.store.last(ticker) is not None:
+            ticker_data[ticker] = self.store.frame(ticker, start_date, end_date).assign(ticker=ticker.upper())
 
     async def get_ticker_data(self, tickers: List[str],
                               start_date: datetime,
@@ -74,22 +105,15 @@ class YahooStocks:
         return ticker_data
 
     def get_adjclose_stats(self,
-                           ticker_data: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, float]]:
-        ticker_stats: Dict[str, pd.DataFrame] = {}
-        for ticker in ticker_data.keys():
-            ticker_stats[ticker] = {
-                "mean": ticker_data[ticker]["adjclose"].mean(),
-                "median": ticker_data[ticker]["adjclose"].median(),
-                "std_dev": ticker_data[ticker]["adjclose"].std(),
-                "variance": ticker_data[ticker]["adjclose"].var()
-            }
-        return ticker_stats
+                           ticker_data: Dict[str, pd.DataFrame],
+                           stats: List[str] = DEFAULT_STATS) -> pd.DataFrame:
+        return compute_stats(ticker_data, stats)
 
     async def _get_stats(self,
                          ticker: str,
                          ticker_stats: Dict[str, pd.DataFrame]) -> None:
         try:
-            ticker_stats[ticker] = yahoo_fin.stock_info.get_stats(ticker)
+            ticker_stats[ticker] = await self.fetcher.call(QUOTE_HOST, yahoo_fin.stock_info.get_stats, ticker)
         except Exception as error:
             self.log.error(str(error) + ticker)
 
@@ -127,6 +151,56 @@ class YahooStocks:
             self.log.error(str(error))
         return day_most_active
 
+    async def stream_volatile_tickers(self,
+                                      tickers: List[str],
+                                      beta_threshold: float) -> AsyncIterator[str]:
+        missing = self.beta_index.missing(tickers)
+        expired = self.beta_index.expired(tickers)
+        if expired:
+            self.beta_index.refresh_in_background(expired)
+        for ticker in self.beta_index.screen(tickers, beta_threshold):
+            yield ticker
+        async for ticker, beta in self.beta_index.stream(missing):
+            if beta >= beta_threshold:
+                yield ticker
+
+    async def _get_stats_row(self,
+                             ticker: str,
+                             start_date: datetime,
+                             end_date: datetime,
+                             stats: List[str]) -> Tuple[str, Optional[pd.DataFrame]]:
+        ticker_data: Dict[str, pd.DataFrame] = {}
+        await self._get_data(ticker, ticker_data, start_date, end_date)
+        return ticker, compute_stats(ticker_data, stats) if ticker_data else None
+
+    async def stream_search(self,
+                            exchanges: List[str],
+                            beta_threshold: float,
+                            start_date: datetime,
+                            end_date: datetime,
+                            stats: List[str] = DEFAULT_STATS) -> AsyncIterator[SearchUpdate]:
+        tickers = await self.universe.load(exchanges)
+        pending: Set[asyncio.Future] = set()
+        completed = total = 0
+        try:
+            async for ticker in self.stream_volatile_tickers(tickers, beta_threshold):
+                pending.add(asyncio.ensure_future(self._get_stats_row(ticker, start_date, end_date, stats)))
+                total += 1
+                yield SearchUpdate(None, None, completed, total)
+                for task in [task for task in pending if task.done()]:
+                    pending.remove(task)
+                    completed += 1
+                    yield SearchUpdate(*task.result(), completed, total)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    completed += 1
+                    yield SearchUpdate(*task.result(), completed, total)
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
     async def run(self) -> None:
         end_date = datetime.now()
         start_date = end_date - \
@@ -136,7 +210,7 @@ class YahooStocks:
         ticker_data = await self.get_ticker_data(vol_tickers, start_date, end_date)
         ticker_stats = await self.get_ticker_stats(vol_tickers)
         print(ticker_stats)
-        print(self.get_adjclose_stats(ticker_data))
+        print(self.get_adjclose_stats(ticker_data, self.config.get("stats", DEFAULT_STATS)))
         print(self.get_day_gainers())
         print(self.get_day_losers())
         print(self.get_day_most_active())
@@ -0,0 +1,61 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from datetime import datetime, timedelta
+from beta_index import BetaIndex, BETA_FIELD
+
+LOG = logging.getLogger("test")
+
+
+class StubFetcher:
+    def __init__(self, quotes):
+        self.quotes = quotes
+        self.calls = []
+
+    async def call(self, host, func, ticker):
+        self.calls.append(ticker)
+        quote = self.quotes[ticker]
+        if isinstance(quote, Exception):
+            raise quote
+        return quote
+
+
+def test_refresh_saves_and_reloads(tmp_path):
+    path = str(tmp_path / "beta_index.csv")
+    fetcher = StubFetcher({"AAPL": {BETA_FIELD: 1.3}, "KO": {BETA_FIELD: "0.6"}, "XYZ": {}})
+    index = BetaIndex(LOG, fetcher, path)
+    index.refresh(["AAPL", "KO", "XYZ", "AAPL"])
+
+    assert sorted(fetcher.calls) == ["AAPL", "KO", "XYZ"]
+    reloaded = BetaIndex(LOG, fetcher, path)
+    betas = reloaded.table["beta"]
+    assert sorted(betas.index) == ["AAPL", "KO", "XYZ"]
+    assert (betas["AAPL"], betas["KO"]) == (1.3, 0.6) and np.isnan(betas["XYZ"])
+    assert (datetime.now() - reloaded.table["as_of"] < timedelta(minutes=1)).all()
+    assert reloaded.missing(["AAPL", "MSFT"]) == ["MSFT"]
+
+
+def test_failed_fetches_are_not_recorded(tmp_path):
+    fetcher = StubFetcher({"AAPL": ConnectionError("reset")})
+    index = BetaIndex(LOG, fetcher, str(tmp_path / "beta_index.csv"))
+    index.refresh(["AAPL"])
+    assert index.missing(["AAPL"]) == ["AAPL"]
+
+
+def test_expired(tmp_path):
+    index = BetaIndex(LOG, StubFetcher({}), str(tmp_path / "beta_index.csv"), max_age_days=7)
+    now = datetime.now()
+    index.table = pd.DataFrame({"beta": [1., 2.], "as_of": [now - timedelta(days=8), now - timedelta(days=1)]},
+                               index=pd.Index(["OLD", "NEW"], name="ticker"))
+    assert index.expired(["OLD", "NEW", "MISSING"]) == ["OLD"]
+
+
+def test_screen_keeps_order_and_skips_unknown_betas(tmp_path):
+    index = BetaIndex(LOG, StubFetcher({}), str(tmp_path / "beta_index.csv"))
+    index.table = pd.DataFrame({"beta": [1.5, 0.4, np.nan, 2.], "as_of": datetime.now()},
+                               index=pd.Index(["TSLA", "KO", "XYZ", "AMD"], name="ticker"))
+    screened = index.screen(["AMD", "KO", "MISSING", "XYZ", "TSLA"], 1.)
+    assert screened == ["AMD", "TSLA"]
+    assert all(type(ticker) is str for ticker in screened)
@@ -0,0 +1,83 @@
+import time
+import asyncio
+import logging
+import threading
+
+import pytest
+import requests
+
+from fetch_engine import FetchEngine, run_sync
+
+LOG = logging.getLogger("test")
+
+
+def flaky(failures, error):
+    calls = []
+
+    def fetch(ticker):
+        calls.append(ticker)
+        if len(calls) <= failures:
+            raise error
+        return ticker.upper()
+    return fetch, calls
+
+
+def test_transport_errors_are_retried():
+    engine = FetchEngine(LOG, retries=2, backoff=0., requests_per_second=0.)
+    fetch, calls = flaky(2, requests.ConnectionError("reset"))
+    assert run_sync(engine.call("host", fetch, "aapl")) == "AAPL"
+    assert len(calls) == 3
+
+
+def test_server_errors_are_retried_and_client_errors_are_not():
+    engine = FetchEngine(LOG, retries=2, backoff=0., requests_per_second=0.)
+    response = requests.Response()
+    response.status_code = 503
+    fetch, calls = flaky(1, requests.HTTPError(response=response))
+    assert run_sync(engine.call("host", fetch, "aapl")) == "AAPL"
+    assert len(calls) == 2
+
+    response.status_code = 404
+    fetch, calls = flaky(1, requests.HTTPError(response=response))
+    with pytest.raises(requests.HTTPError):
+        run_sync(engine.call("host", fetch, "aapl"))
+    assert len(calls) == 1
+
+
+def test_other_errors_are_not_retried():
+    engine = FetchEngine(LOG, retries=2, backoff=0., requests_per_second=0.)
+    fetch, calls = flaky(1, KeyError("Beta"))
+    with pytest.raises(KeyError):
+        run_sync(engine.call("host", fetch, "aapl"))
+    assert len(calls) == 1
+
+
+def test_timed_out_call_keeps_its_slot():
+    engine = FetchEngine(LOG, retries=0, requests_per_second=0., timeout=0.05, max_in_flight=1)
+    release = threading.Event()
+
+    def hang():
+        release.wait(5.)
+
+    with pytest.raises(asyncio.TimeoutError):
+        run_sync(engine.call("host", hang))
+    assert not engine.slots("host").acquire(blocking=False)
+    release.set()
+    time.sleep(0.1)
+    assert run_sync(engine.call("host", str.upper, "aapl")) == "AAPL"
+
+
+def test_timed_out_queued_call_returns_its_slot():
+    engine = FetchEngine(LOG, max_workers=1, retries=0, requests_per_second=0., timeout=0.2)
+
+    async def both():
+        return await asyncio.gather(engine.call("a", time.sleep, 0.5), engine.call("b", time.sleep, 0.01),
+                                    return_exceptions=True)
+
+    outcomes = run_sync(both())
+    assert all(isinstance(outcome, asyncio.TimeoutError) for outcome in outcomes)
+    time.sleep(0.5)
+    for host in ("a", "b"):
+        slots = engine.slots(host)
+        assert all(slots.acquire(blocking=False) for _ in range(engine.max_in_flight))
+        assert not slots.acquire(blocking=False)
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stats_engine import ATR_WINDOW, STATISTICS, TRADING_DAYS, compute_stats
+
+STATS = list(STATISTICS)
+
+
+def history(seed, start, periods):
+    generator = np.random.default_rng(seed)
+    close = 100. * np.exp(np.cumsum(generator.normal(0., 0.02, periods)))
+    spread = generator.uniform(0.5, 2., periods)
+    return pd.DataFrame({"close": close, "adjclose": close * 0.98, "high": close + spread, "low": close - spread},
+                        index=pd.date_range(start, periods=periods, freq="B"))
+
+
+@pytest.fixture
+def ticker_data():
+    return {"AAPL": history(1, "2020-01-01", 120), "KO": history(2, "2020-02-03", 80),
+            "TSLA": history(3, "2020-01-01", 60)}
+
+
+def per_ticker(frame):
+    adjclose = frame["adjclose"]
+    previous = frame["close"].shift()
+    true_range = pd.concat([frame["high"] - frame["low"], (frame["high"] - previous).abs(),
+                            (frame["low"] - previous).abs()], axis=1).max(axis=1, skipna=False)
+    return {
+        "mean": adjclose.mean(),
+        "median": adjclose.median(),
+        "std_dev": adjclose.std(),
+        "variance": adjclose.var(),
+        "realized_vol": np.log(adjclose).diff().std() * np.sqrt(TRADING_DAYS),
+        "max_drawdown": (adjclose / adjclose.cummax() - 1.).min(),
+        "atr": true_range.iloc[1:].iloc[-ATR_WINDOW:].mean()
+    }
+
+
+def test_matches_per_ticker_loop(ticker_data):
+    expected = pd.DataFrame({ticker: per_ticker(frame) for ticker, frame in ticker_data.items()}).T[STATS]
+    result = compute_stats(ticker_data, STATS)
+    assert list(result.index) == list(ticker_data) and list(result.columns) == STATS
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(dtype=float), rtol=1e-10)
+
+
+def test_gaps_match_per_ticker_loop(ticker_data):
+    ticker_data["KO"] = ticker_data["KO"].drop(ticker_data["KO"].index[list(range(10, 15)) + [-5]])
+    expected = pd.DataFrame({ticker: per_ticker(frame) for ticker, frame in ticker_data.items()}).T[STATS]
+    result = compute_stats(ticker_data, STATS)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(dtype=float), rtol=1e-10)
+
+
+def test_empty_and_unknown():
+    assert compute_stats({}).empty
+    with pytest.raises(ValueError):
+        compute_stats({}, ["mean", "sharpe"])
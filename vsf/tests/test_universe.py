@@ -0,0 +1,68 @@
+import json
+import logging
+
+import pytest
+
+import universe
+
+from fetch_engine import WIKIPEDIA_HOST
+from universe import UniverseRegistry
+
+LOG = logging.getLogger("test")
+
+
+class StubFetcher:
+    def __init__(self):
+        self.hosts = []
+
+    async def call(self, host, func, *args):
+        self.hosts.append(host)
+        return func(*args)
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    calls = []
+
+    def loader(exchange, tickers):
+        def load():
+            calls.append(exchange)
+            if isinstance(tickers, Exception):
+                raise tickers
+            return tickers
+        return load
+
+    def install(**exchanges):
+        monkeypatch.setattr(universe, "EXCHANGE_LOADERS",
+                            {exchange: loader(exchange, tickers) for exchange, tickers in exchanges.items()})
+    install.calls = calls
+    return install
+
+
+def test_fresh_cache_is_reused(tmp_path, loads):
+    loads(dow=[" aapl", "MSFT", ""], sp500=["MSFT", "KO"])
+    fetcher = StubFetcher()
+    registry = UniverseRegistry(LOG, fetcher, str(tmp_path), ttl_hours=1)
+    assert registry.tickers(["dow", "sp500", "dow"]) == ["AAPL", "MSFT", "KO"]
+    assert fetcher.hosts == [WIKIPEDIA_HOST, WIKIPEDIA_HOST]
+    assert registry.tickers(["dow", "sp500"]) == ["AAPL", "MSFT", "KO"]
+    assert sorted(loads.calls) == ["dow", "sp500"]
+    assert UniverseRegistry(LOG, StubFetcher(), str(tmp_path)).tickers(["dow"]) == ["AAPL", "MSFT"]
+    assert sorted(loads.calls) == ["dow", "sp500"]
+
+
+def test_expired_cache_is_reloaded(tmp_path, loads):
+    loads(dow=["AAPL"])
+    registry = UniverseRegistry(LOG, StubFetcher(), str(tmp_path), ttl_hours=1)
+    registry.tickers(["dow"])
+    path = tmp_path / "dow.json"
+    path.write_text(json.dumps(dict(json.loads(path.read_text()), as_of=0.)))
+    registry.tickers(["dow"])
+    assert loads.calls == ["dow", "dow"]
+
+
+def test_failed_reload_falls_back_to_stale_cache(tmp_path, loads):
+    (tmp_path / "dow.json").write_text(json.dumps({"as_of": 0., "tickers": ["AAPL"]}))
+    loads(dow=ConnectionError("reset"), nasdaq=ConnectionError("reset"))
+    registry = UniverseRegistry(LOG, StubFetcher(), str(tmp_path), ttl_hours=1)
+    assert registry.tickers(["dow", "nasdaq", "unknown"]) == ["AAPL"]